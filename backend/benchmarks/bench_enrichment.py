@@ -0,0 +1,84 @@
+"""
+Benchmark for the flight option enrichment stage.
+
+Compares the dict-building helpers (calculate_price + calculate_meta on every option) with
+enrich_flight_options, which returns immutable records, on synthetic legs of the size our
+bulk-quote jobs produce.
+
+Usage (from backend/):
+    python -m benchmarks.bench_enrichment [--sizes 1000 5000 10000] [--repeat 5]
+"""
+import argparse
+import datetime
+import random
+import timeit
+
+from benchmarks.support import setup_django
+
+setup_django()
+
+from core.services import calculate_meta, calculate_price, enrich_flight_options  # noqa: E402
+
+
+DISTANCE_KM = 3140.0
+
+
+def synthetic_options(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    base = datetime.datetime(2025, 12, 20, 6, 0)
+    options = []
+    for _ in range(count):
+        departure = base + datetime.timedelta(minutes=15 * rng.randrange(64))
+        arrival = departure + datetime.timedelta(minutes=30 * rng.randrange(4, 16))
+        options.append({
+            'departure_time': departure.isoformat(),
+            'arrival_time': arrival.isoformat(),
+            'price': {'fare': round(rng.uniform(150, 4000), 2)},
+            'aircraft': {'model': rng.choice(['A320', 'B737', 'E195'])},
+        })
+    return options
+
+
+def per_option(options, distance):
+    processed = []
+    for option in options:
+        flight = dict(option)
+        flight['price'] = calculate_price(option['price']['fare'])
+        flight['meta'] = calculate_meta(flight, distance)
+        processed.append(flight)
+    return processed
+
+
+def enriched(options, distance):
+    return [option.as_dict() for option in enrich_flight_options(options, distance)]
+
+
+def run(sizes, repeat):
+    results = []
+    for size in sizes:
+        options = synthetic_options(size)
+        assert per_option(options, DISTANCE_KM) == enriched(options, DISTANCE_KM)
+        row = {'options': size}
+        for name, func in (('per_option', per_option), ('enriched', enriched)):
+            best = min(timeit.repeat(lambda: func(options, DISTANCE_KM), number=1, repeat=repeat))
+            row[f'{name}_ms'] = round(best * 1000, 3)
+        row['speedup'] = round(row['per_option_ms'] / row['enriched_ms'], 2)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for row in run(args.sizes, args.repeat):
+        print(
+            f"{row['options']:>7} options/leg  per-option {row['per_option_ms']:>9.3f} ms  "
+            f"enriched {row['enriched_ms']:>9.3f} ms  x{row['speedup']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
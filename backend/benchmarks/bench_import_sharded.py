@@ -0,0 +1,62 @@
+"""
+Benchmark for the sharded airport import.
+
+Times the normalization stage and the full import_airports_from_api run on synthetic feeds
+for several worker counts. The feed is served from memory, so only our own work is measured.
+
+Usage (from backend/):
+    python -m benchmarks.bench_import_sharded [--sizes 10000 40000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import time
+from unittest.mock import patch
+
+from benchmarks.support import benchmark_database, setup_django
+
+setup_django()
+
+from benchmarks.synthetic import airport_feed  # noqa: E402
+from core.models import Airport  # noqa: E402
+from core.services import import_airports_from_api  # noqa: E402
+from core.utils.airport_record_utils import normalize_airport_records  # noqa: E402
+
+
+def time_normalize(feed, workers):
+    records = list(feed.items())
+    started = time.perf_counter()
+    normalize_airport_records(records, workers=workers)
+    return time.perf_counter() - started
+
+
+def time_import(feed, workers):
+    Airport.objects.all().delete()
+    with patch('core.services.requests.get') as mock_get, \
+            patch.dict(os.environ, {'AIRPORT_DATA_URL': 'http://benchmark.invalid/airports'}):
+        mock_get.return_value.json.return_value = feed
+        mock_get.return_value.raise_for_status.return_value = None
+        started = time.perf_counter()
+        result = import_airports_from_api(workers=workers)
+        elapsed = time.perf_counter() - started
+    assert result['status'] == 'SUCCESS', result['details']
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 40000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with benchmark_database():
+        for size in args.sizes:
+            feed = airport_feed(size)
+            for workers in args.workers:
+                normalize_s = time_normalize(feed, workers)
+                import_s = time_import(feed, workers)
+                print(f"{size:>7} airports  workers={workers:<2}  normalize {normalize_s * 1000:>9.1f} ms  "
+                      f"full import {import_s * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
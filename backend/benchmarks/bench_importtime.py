@@ -0,0 +1,108 @@
+"""
+Import-time benchmark for process start-up.
+
+Boots fresh interpreters the way a worker does (WSGI application plus URLconf, i.e. every view)
+under `python -X importtime`, and reports the total import time and the heaviest modules. Writes
+results in the benchmarks.run format, so benchmarks.compare can diff them, and exits with status 1
+when a module that should be imported lazily shows up at boot or the median exceeds --budget-ms.
+
+Usage (from backend/):
+    python -m benchmarks.bench_importtime [--runs 5] [--top 15] [--budget-ms 400] [--forbid requests] [--output importtime.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+BOOT_SCRIPT = (
+    "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'import_airports.settings'); "
+    "import import_airports.wsgi; "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+# Imported on first use only; seeing them at boot means an eager import crept back in
+LAZY_MODULES = ['requests', 'urllib3']
+
+
+def run_once() -> Tuple[int, Dict[str, int], Set[str]]:
+    """Returns (total import microseconds, cumulative microseconds per module, modules imported)."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+    total = 0
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <2 spaces per nesting level><module>"
+        _, cumulative_us, name = line.split('|')
+        cumulative[name.strip()] = int(cumulative_us)
+        if not name[1:].startswith(' '):  # top-level import (not nested under another one)
+            total += int(cumulative_us)
+    return total, cumulative, set(cumulative)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='Heaviest modules to list (median cumulative time).')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Fail when the median total import time exceeds this.')
+    parser.add_argument('--forbid', nargs='*', default=LAZY_MODULES, help='Modules that must not be imported at boot.')
+    parser.add_argument('--output', '-o', help='Write JSON results (benchmarks.run format) to this file.')
+    args = parser.parse_args()
+
+    totals: List[int] = []
+    per_module: Dict[str, List[int]] = defaultdict(list)
+    imported: Set[str] = set()
+    for _ in range(args.runs):
+        total, cumulative, modules = run_once()
+        totals.append(total)
+        imported |= modules
+        for module, microseconds in cumulative.items():
+            per_module[module].append(microseconds)
+
+    totals.sort()
+    median_ms = statistics.median(totals) / 1000
+    print(f"{'module':<48} {'cumulative ms':>14}")
+    heaviest = sorted(per_module.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:args.top]
+    for module, samples in heaviest:
+        print(f"{module:<48} {statistics.median(samples) / 1000:>14.1f}")
+    print(f"\nTotal import time: median {median_ms:.1f} ms, min {totals[0] / 1000:.1f} ms over {args.runs} runs")
+
+    if args.output:
+        report = {
+            'meta': {'python': sys.version.split()[0], 'boot': BOOT_SCRIPT},
+            'results': {
+                'importtime.boot': {
+                    'runs': args.runs,
+                    'min_ms': round(totals[0] / 1000, 3),
+                    'median_ms': round(median_ms, 3),
+                    'p95_ms': round(totals[min(len(totals) - 1, int(len(totals) * 0.95))] / 1000, 3),
+                    'mean_ms': round(statistics.fmean(totals) / 1000, 3),
+                    'modules': len(imported),
+                },
+            },
+        }
+        with open(args.output, 'w') as output:
+            output.write(json.dumps(report, indent=2) + '\n')
+
+    failures = [f"'{module}' is imported at boot" for module in args.forbid if module in imported]
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    if failures:
+        print('\n' + '\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
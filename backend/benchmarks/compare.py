@@ -0,0 +1,66 @@
+"""
+Compares two benchmarks.run result files case by case.
+
+Usage (from backend/):
+    python -m benchmarks.compare baseline.json results.json [--threshold 0.15] [--metric median_ms]
+
+Exits with status 1 when any case shared by both files got slower than the threshold allows.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    metric: str = 'median_ms',
+    threshold: float = 0.15,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Returns one row per case and the names of the cases that regressed past `threshold`."""
+    rows = []
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    current_results = current.get('results', {})
+    for name in sorted(set(baseline_results) | set(current_results)):
+        before = baseline_results.get(name, {}).get(metric)
+        after = current_results.get(name, {}).get(metric)
+        change = (after - before) / before if before and after is not None else None
+        regressed = change is not None and change > threshold
+        if regressed:
+            regressions.append(name)
+        rows.append({'case': name, 'baseline': before, 'current': after, 'change': change, 'regressed': regressed})
+    return rows, regressions
+
+
+def _format(value: Any) -> str:
+    return f"{value:.3f}" if isinstance(value, (int, float)) else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares two benchmark result files.')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--metric', default='median_ms', choices=['min_ms', 'median_ms', 'p95_ms', 'mean_ms'])
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Allowed slowdown as a fraction of the baseline (default 0.15 = 15%%).')
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+
+    rows, regressions = compare_results(baseline, current, args.metric, args.threshold)
+    print(f"{'case':<28} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row['change'] is not None else 'n/a'
+        flag = '  REGRESSION' if row['regressed'] else ''
+        print(f"{row['case']:<28} {_format(row['baseline']):>12} {_format(row['current']):>12} {change:>9}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold:.0%} over baseline ({args.metric}).")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Local stand-in for the Mock Airlines and airport feed APIs, so benchmarks run offline.
+
+    GET /search/<key>/<from>/<to>/<date>   -> {"summary": {...}, "options": [...]}
+    GET /airports                          -> synthetic airport feed
+
+The number of options per search and the airport feed size are set on the server instance.
+"""
+import datetime
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from benchmarks.synthetic import airport_feed
+
+
+def flight_options(origin: str, destination: str, date: str, count: int) -> Dict[str, Any]:
+    rng = random.Random(f"{origin}{destination}{date}")
+    day = datetime.datetime.fromisoformat(date)
+    options = []
+    for index in range(count):
+        departure = day + datetime.timedelta(minutes=5 * rng.randrange(0, 200))
+        arrival = departure + datetime.timedelta(minutes=rng.randrange(60, 480))
+        options.append({
+            'flight_number': f"MA{index:04d}",
+            'departure_time': departure.isoformat(),
+            'arrival_time': arrival.isoformat(),
+            'price': {'fare': round(rng.uniform(150, 4000), 2)},
+            'aircraft': {'model': rng.choice(['A320', 'B737', 'E195']), 'manufacturer': 'Mock'},
+        })
+    return {
+        'summary': {'departure_date': date, 'from': origin, 'to': destination, 'currency': 'BRL'},
+        'options': options,
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'MockAirlinesServer'
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('?')[0].split('/')
+        if parts[0] == 'search' and len(parts) == 5:
+            _, _, origin, destination, date = parts
+            body = flight_options(origin, destination, date, self.server.options_per_search)
+        elif parts == ['airports']:
+            body = self.server.airport_feed
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockAirlinesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, options_per_search: int = 10, airports: int = 1000):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.options_per_search = options_per_search
+        self.airport_feed = airport_feed(airports)
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
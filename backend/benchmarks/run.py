@@ -0,0 +1,226 @@
+"""
+Offline benchmark suite for the search, import and log paths.
+
+Runs against a throwaway database and the local mock Airlines server, and writes
+machine-readable results that benchmarks.compare can diff between runs.
+
+Usage (from backend/):
+    python -m benchmarks.run [--suites search import logs airports] [--quick] [--output results.json]
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+from unittest.mock import patch
+
+from benchmarks.support import benchmark_database, setup_django
+
+os.environ.setdefault('MOCK_API_KEY', 'benchmark')
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'False')
+setup_django()
+
+from django.core.cache import cache  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from benchmarks.mock_airlines import MockAirlinesServer  # noqa: E402
+from benchmarks.synthetic import airport_feed  # noqa: E402
+from core import services  # noqa: E402
+from core.models import Airport, AirportChange, ApplicationLog  # noqa: E402
+from core.utils.search_cache_utils import SEARCH_CACHE_PREFIX, search_cache_key  # noqa: E402
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+    warmup: int = 0,
+) -> Dict[str, float]:
+    """Runs `func` `repeat` times (calling `setup` untimed before each run) and summarizes the timings."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        'runs': repeat,
+        'min_ms': round(samples[0] * 1000, 3),
+        'median_ms': round(median * 1000, 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+        'per_second': round(1 / median, 2) if median else None,
+    }
+
+
+def bench_search(server: MockAirlinesServer, option_counts, repeat) -> Dict[str, Any]:
+    """find_flight_combinations end to end on a cache miss: 2 upstream calls, enrichment, combinations."""
+    Airport.objects.update_or_create(iata='POA', defaults={'city': 'Porto Alegre', 'state': 'RS', 'lat': -30.03, 'lon': -51.23})
+    Airport.objects.update_or_create(iata='MAO', defaults={'city': 'Manaus', 'state': 'AM', 'lat': -3.13, 'lon': -60.02})
+    today = datetime.date.today()
+    departure = (today + datetime.timedelta(days=30)).isoformat()
+    ret = (today + datetime.timedelta(days=37)).isoformat()
+    key = search_cache_key('POA', 'MAO', departure, ret)
+
+    def forget_search():
+        # Only the search's own entries: clearing the whole cache would also drop the airport index
+        # and fee schedule version stamps, timing their rebuild as part of every run
+        cache.delete_many([key, f"{key}:refreshing", f"{SEARCH_CACHE_PREFIX}:hits:POA:MAO"])
+
+    results = {}
+    with patch.object(services, 'MOCK_API_BASE_URL', f"{server.base_url}/search"), \
+            patch('core.utils.fare_history_utils.FARE_HISTORY_ENABLED', False):
+        for count in option_counts:
+            server.options_per_search = count
+            stats = measure(
+                lambda: services.find_flight_combinations('POA', 'MAO', departure, ret),
+                repeat,
+                setup=forget_search,
+                warmup=1,
+            )
+            results[f'search.options_{count}'] = {**stats, 'combinations': count * count}
+    return results
+
+
+def bench_import(server: MockAirlinesServer, sizes, repeat) -> Dict[str, Any]:
+    """import_airports_from_api into an empty table, fetching the feed over HTTP from the mock server."""
+    def reset():
+        AirportChange.objects.all().delete()
+        Airport.objects.all().delete()
+
+    results = {}
+    with patch.dict(os.environ, {'AIRPORT_DATA_URL': f"{server.base_url}/airports"}):
+        for size in sizes:
+            server.airport_feed = airport_feed(size)
+            runs = repeat if size < 10000 else max(1, repeat // 3)
+            stats = measure(services.import_airports_from_api, runs, setup=reset)
+            results[f'import.airports_{size}'] = {**stats, 'feed_rows': size, 'airports': Airport.objects.count()}
+    reset()
+    return results
+
+
+def bench_logs(rows: int, repeat) -> Dict[str, Any]:
+    """LogsView pages on a large ApplicationLog table: first page, a deep page and a level filter."""
+    ApplicationLog.objects.all().delete()
+    now = timezone.now()
+    levels = ['INFO'] * 7 + ['DEBUG', 'WARNING', 'ERROR']
+    ApplicationLog.objects.bulk_create(
+        [
+            ApplicationLog(
+                timestamp=now - datetime.timedelta(seconds=index * 26),
+                level=levels[index % len(levels)],
+                module='benchmarks',
+                message=f'Synthetic log entry {index}',
+                extra_data={'index': index},
+            )
+            for index in range(rows)
+        ],
+        batch_size=5000,
+    )
+
+    client = Client()
+    headers = {'HTTP_AUTHORIZATION': f"Token {os.environ['MOCK_API_KEY']}"}
+    deep_page = max(1, rows // 50 // 2)
+    cases = {
+        'logs.first_page': {'page': 1},
+        'logs.deep_page': {'page': deep_page},
+        'logs.level_error': {'level': 'ERROR'},
+    }
+    results = {}
+    for name, params in cases.items():
+        def request(params=params):
+            response = client.get('/api/logs/', params, **headers)
+            assert response.status_code == 200, response.content
+        results[name] = {**measure(request, repeat, warmup=1), 'rows': rows}
+    return results
+
+
+def bench_airport_list(count: int, repeat) -> Dict[str, Any]:
+    """AirportListView serializing the whole catalog."""
+    Airport.objects.all().delete()
+    Airport.objects.bulk_create(
+        [Airport(**record) for record in airport_feed(count).values()],
+        batch_size=5000,
+        ignore_conflicts=True,
+    )
+    client = Client()
+
+    def request():
+        response = client.get('/api/airports/')
+        assert response.status_code == 200
+
+    return {'airports.list': {**measure(request, repeat, warmup=1), 'airports': Airport.objects.count()}}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--suites', nargs='+', default=['search', 'import', 'logs', 'airports'],
+                        choices=['search', 'import', 'logs', 'airports'])
+    parser.add_argument('--quick', action='store_true', help='Smaller inputs and fewer runs, for a fast smoke run.')
+    parser.add_argument('--repeat', type=int, default=None, help='Runs per case (default 10, or 3 with --quick).')
+    parser.add_argument('--output', '-o', help='Write the JSON results to this file (default: stdout).')
+    args = parser.parse_args()
+
+    repeat = args.repeat or (3 if args.quick else 10)
+    option_counts = [10, 50] if args.quick else [10, 100, 300]
+    import_sizes = [1000] if args.quick else [1000, 10000, 40000]
+    log_rows = 10000 if args.quick else 200000
+    airport_count = 1000 if args.quick else 10000
+
+    results: Dict[str, Any] = {}
+    with benchmark_database(), MockAirlinesServer() as server:
+        if 'search' in args.suites:
+            results.update(bench_search(server, option_counts, repeat))
+        if 'import' in args.suites:
+            results.update(bench_import(server, import_sizes, repeat))
+        if 'logs' in args.suites:
+            results.update(bench_logs(log_rows, repeat))
+        if 'airports' in args.suites:
+            results.update(bench_airport_list(airport_count, repeat))
+
+    report = {
+        'meta': {
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': os.environ.get('DB_ENGINE', 'sqlite'),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+
+    for name, stats in results.items():
+        print(f"{name:<28} median {stats['median_ms']:>10.3f} ms  p95 {stats['p95_ms']:>10.3f} ms", file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(payload + '\n')
+    else:
+        print(payload)
+
+
+if __name__ == '__main__':
+    main()
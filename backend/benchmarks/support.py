@@ -0,0 +1,31 @@
+"""Django bootstrap for benchmarks: settings, a private cache and a throwaway database."""
+import atexit
+import contextlib
+import os
+
+import django
+
+
+def setup_django() -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'import_airports.settings')
+    django.setup()
+
+    # Synthetic search results must never land in the cache the server reads from
+    from import_airports.test_runner import isolated_cache
+
+    stack = contextlib.ExitStack()
+    stack.enter_context(isolated_cache())
+    atexit.register(stack.close)
+
+
+@contextlib.contextmanager
+def benchmark_database():
+    """Creates and migrates a test database (in memory for SQLite) and drops it afterwards."""
+    from django.db import connection
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,43 @@
+"""Synthetic data generators shared by the benchmarks."""
+import itertools
+import random
+import string
+from typing import Any, Dict
+
+
+STATES = ['AC', 'AM', 'BA', 'DF', 'MG', 'PR', 'RJ', 'RS', 'SC', 'SP']
+
+
+# Distinct three-character codes: letters only first, then codes with digits (valid, see airport_record_utils)
+LETTER_CODES = [''.join(chars) for chars in itertools.product(string.ascii_uppercase, repeat=3)]
+MIXED_CODES = [
+    code for code in (''.join(chars) for chars in itertools.product(string.ascii_uppercase + string.digits, repeat=3))
+    if not code.isalpha()
+]
+MAX_AIRPORTS = len(LETTER_CODES) + len(MIXED_CODES)
+
+
+def airport_feed(count: int, seed: int = 7) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds an airport feed shaped like the AIRPORT_DATA_URL response ({code: record}) with `count`
+    distinct IATA codes, so every row is a separate airport. Up to 17,576 codes are three letters;
+    larger feeds add alphanumeric codes, up to MAX_AIRPORTS (46,656).
+    """
+    if count > MAX_AIRPORTS:
+        raise ValueError(f"At most {MAX_AIRPORTS} distinct three-character IATA codes exist, got {count}.")
+    rng = random.Random(seed)
+    letter_codes, mixed_codes = LETTER_CODES[:], MIXED_CODES[:]
+    rng.shuffle(letter_codes)
+    rng.shuffle(mixed_codes)
+    codes = letter_codes + mixed_codes
+    feed = {}
+    for index in range(count):
+        iata = codes[index]
+        feed[iata] = {
+            'iata': iata,
+            'city': f"City {index}",
+            'state': rng.choice(STATES),
+            'lat': round(rng.uniform(-33.7, 5.2), 4),
+            'lon': round(rng.uniform(-73.9, -34.8), 4),
+        }
+    return feed
@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.models.fee_rule_model import FeeRule
+
+
+@admin.register(FeeRule)
+class FeeRuleAdmin(admin.ModelAdmin):
+    # Saving or deleting a rule invalidates the compiled fee schedule (core/signals.py)
+    list_display = ('__str__', 'origin', 'destination', 'airline', 'rate', 'minimum_fee', 'active', 'updated_at')
+    list_editable = ('rate', 'minimum_fee', 'active')
+    list_filter = ('active', 'airline')
+    search_fields = ('origin', 'destination', 'airline', 'description')
@@ -0,0 +1,61 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.services import FLIGHT_BATCH_CONCURRENCY, search_flights_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs many flight searches with a bounded worker pool and writes the results as NDJSON. '
+        'Input is a CSV file with from,to,departureDate,returnDate rows ("-" reads stdin).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV file with from,to,departureDate,returnDate rows, or "-" for stdin.')
+        parser.add_argument('--output', '-o', help='NDJSON output file (defaults to stdout).')
+        parser.add_argument('--concurrency', type=int, default=FLIGHT_BATCH_CONCURRENCY,
+                            help=f'Number of searches running at once (default {FLIGHT_BATCH_CONCURRENCY}).')
+
+    def handle(self, *args, **options):
+        queries = self._read_queries(options['input'])
+        try:
+            results = search_flights_batch(queries, concurrency=options['concurrency'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'w') if options['output'] else self.stdout
+        failed = 0
+        try:
+            for line in results:
+                failed += line['status'] != 200
+                output.write(json.dumps(line, cls=DjangoJSONEncoder) + '\n')
+        finally:
+            if options['output']:
+                output.close()
+
+        self.stderr.write(self.style.SUCCESS(
+            f"Batch finished: {len(queries)} searches, {len(queries) - failed} succeeded, {failed} failed."
+        ))
+
+    def _read_queries(self, path):
+        source = sys.stdin if path == '-' else open(path, newline='')
+        try:
+            rows = [row for row in csv.reader(source) if row and not row[0].startswith('#')]
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        # Skip an optional header row
+        if rows and rows[0][0].strip().lower() == 'from':
+            rows = rows[1:]
+        queries = []
+        for number, row in enumerate(rows, start=1):
+            if len(row) != 4:
+                raise CommandError(f"Row {number} must have 4 columns (from,to,departureDate,returnDate): {row}")
+            origin, destination, departure_date, return_date = (value.strip() for value in row)
+            queries.append({'from': origin, 'to': destination, 'departureDate': departure_date, 'returnDate': return_date})
+        return queries
@@ -4,15 +4,20 @@ from core.services import import_airports_from_api
 class Command(BaseCommand):
     help = 'Fetches the latest airport data from the API and updates the local database.'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processes used to validate and normalize the feed, sharded by IATA prefix '
+                                 '(default AIRPORT_IMPORT_WORKERS or 1).')
+
     def handle(self, *args, **options):
         self.stdout.write("Starting airport import process...")
         
-        result = import_airports_from_api()
+        result = import_airports_from_api(workers=options['workers'])
 
         if result['status'] == 'SUCCESS':
             self.stdout.write(self.style.SUCCESS(
                 f"Import completed successfully! "
-                f"Created: {result['created']}, Updated: {result['updated']}."
+                f"Created: {result['created']}, Updated: {result['updated']}, Deleted: {result['deleted']}, Rejected: {result['rejected']}."
             ))
         else:
             self.stdout.write(self.style.ERROR(
@@ -0,0 +1,65 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import rank_popular_searches, warm_flight_search_cache
+from core.utils.search_cache_utils import is_process_local_cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-fetches the most searched routes into the flight search cache, ranked by recent search '
+        'frequency, within a budget of upstream calls per minute.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since-hours', type=int, default=24,
+                            help='Rank searches made in the last N hours (default 24).')
+        parser.add_argument('--limit', type=int, default=50,
+                            help='Warm at most N searches, most popular first (default 50).')
+        parser.add_argument('--calls-per-minute', type=int, default=60,
+                            help='Upstream API calls allowed per minute; each search costs 2 (default 60).')
+        parser.add_argument('--max-calls', type=int, default=None,
+                            help='Upstream API calls allowed per run (default: unlimited).')
+        parser.add_argument('--every', type=int, default=None,
+                            help='Keep running, warming again every N seconds.')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+
+    def handle(self, *args, **options):
+        if options['calls_per_minute'] < 1:
+            raise CommandError("--calls-per-minute must be at least 1.")
+        if is_process_local_cache():
+            # The entries would live and die with this command, unseen by the server processes
+            raise CommandError(
+                f"The cache backend ({settings.CACHES['default']['BACKEND']}) is local to this process, so the "
+                "server would never see the warmed entries. Use a shared DJANGO_CACHE_BACKEND (file-based, "
+                "database, memcached or redis)."
+            )
+        while True:
+            self._warm(options)
+            if not options['every']:
+                return
+            time.sleep(options['every'])
+
+    def _warm(self, options):
+        searches = rank_popular_searches(since_hours=options['since_hours'], limit=options['limit'])
+        self.stdout.write(f"Warming {len(searches)} popular searches...")
+
+        report = warm_flight_search_cache(
+            searches,
+            calls_per_minute=options['calls_per_minute'],
+            max_calls=options['max_calls'],
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            for row in report:
+                self.stdout.write(f"{row['status']:<16} {row['key']} (hits: {row['hits']})")
+
+        warmed = sum(row['status'] == 'warmed' for row in report)
+        self.stdout.write(self.style.SUCCESS(
+            f"Warm-up finished: {warmed} warmed, {len(report) - warmed} skipped or failed."
+        ))
@@ -0,0 +1 @@
+"""Middleware package for the core application."""
@@ -0,0 +1,43 @@
+import time
+
+from django.db import connection
+
+from core.utils.timing_utils import (
+    REQUEST_TIMING_ENABLED,
+    finish_request_timings,
+    metrics,
+    start_request_timings,
+)
+
+
+class RequestTimingMiddleware:
+    """
+    Times every request, counts its database queries and adds a Server-Timing header with the
+    phases recorded through core.utils.timing_utils.timed_phase. Durations and query counts are
+    aggregated per view into the histograms served at /metrics.
+
+    For streaming responses the duration covers building the response, not sending its body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not REQUEST_TIMING_ENABLED:
+            return self.get_response(request)
+
+        timings, token = start_request_timings()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(timings.query_wrapper):
+                response = self.get_response(request)
+        finally:
+            finish_request_timings(token)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = timings.server_timing(total)
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        metrics.observe('http_request_duration_seconds', total, view=view, method=request.method, status=str(response.status_code))
+        metrics.observe('http_request_db_queries', timings.db_queries, view=view)
+        return response
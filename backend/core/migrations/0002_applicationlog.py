@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='airport',
+            options={'ordering': ['iata'], 'verbose_name': 'Airport'},
+        ),
+        migrations.AlterField(
+            model_name='airport',
+            name='iata',
+            field=models.CharField(db_index=True, max_length=3, unique=True),
+        ),
+        migrations.CreateModel(
+            name='ApplicationLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('level', models.CharField(choices=[('DEBUG', 'Debug'), ('INFO', 'Info'), ('WARNING', 'Warning'), ('ERROR', 'Error'), ('CRITICAL', 'Critical')], db_index=True, max_length=10)),
+                ('module', models.CharField(help_text='Module or file where the log originated', max_length=255)),
+                ('message', models.TextField()),
+                ('extra_data', models.JSONField(blank=True, help_text='Additional context data', null=True)),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['-timestamp', 'level'], name='core_applic_timesta_a68183_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_applicationlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FareObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origin', models.CharField(max_length=3)),
+                ('destination', models.CharField(max_length=3)),
+                ('departure_date', models.DateField()),
+                ('flight_number', models.CharField(blank=True, max_length=16)),
+                ('fare', models.FloatField()),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['origin', 'destination', 'fetched_at'], name='fare_route_fetched_idx'), models.Index(fields=['origin', 'destination', 'departure_date', 'fetched_at'], name='fare_route_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_fareobservation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='importlogmodel',
+            index=models.Index(fields=['-start_time', '-id'], name='import_log_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_importlog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AirportChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iata', models.CharField(max_length=3)),
+                ('change_type', models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated')], max_length=10)),
+                ('changes', models.JSONField(default=dict, help_text='Changed fields as {field: [old, new]}.')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('import_log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='airport_changes', to='core.importlogmodel')),
+            ],
+            options={
+                'ordering': ['-changed_at', '-id'],
+                'indexes': [models.Index(fields=['iata', '-changed_at'], name='airport_change_iata_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_airportchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importlogmodel',
+            name='airports_rejected',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importlogmodel',
+            name='rejected_records',
+            field=models.JSONField(default=list, help_text='Feed records rejected by validation, with the reasons.'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:34
+
+from django.db import migrations, models
+
+
+# BRIN indexes suit append-only, time-ordered tables: tiny and cheap to maintain.
+# PostgreSQL only; other databases keep the B-tree indexes declared on the models. ApplicationLog
+# doesn't get one: LogsView's ORDER BY timestamp ... LIMIT needs its B-tree timestamp index anyway.
+BRIN_INDEXES = (
+    ('core_fare_fetched_at_brin', 'core_fareobservation', 'fetched_at'),
+)
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING brin ({column})')
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in BRIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_importlog_rejected_records'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicationlog',
+            index=models.Index(fields=['level', '-timestamp'], name='applog_level_ts_idx'),
+        ),
+        # Redundant with the timestamp index and the composite above
+        migrations.RemoveIndex(
+            model_name='applicationlog',
+            name='core_applic_timesta_a68183_idx',
+        ),
+        migrations.AlterField(
+            model_name='applicationlog',
+            name='level',
+            field=models.CharField(choices=[('DEBUG', 'Debug'), ('INFO', 'Info'), ('WARNING', 'Warning'), ('ERROR', 'Error'), ('CRITICAL', 'Critical')], max_length=10),
+        ),
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
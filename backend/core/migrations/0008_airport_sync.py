@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AirportTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iata', models.CharField(max_length=3, unique=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='importlogmodel',
+            name='airports_deleted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importlogmodel',
+            name='deleted_iatas',
+            field=models.JSONField(default=list, help_text='List of IATA codes of airports removed because they left the feed.'),
+        ),
+        migrations.AlterField(
+            model_name='airportchange',
+            name='change_type',
+            field=models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='airport',
+            index=models.Index(fields=['modified_on', 'id'], name='airport_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='airporttombstone',
+            index=models.Index(fields=['deleted_at'], name='airport_tombstone_deleted_idx'),
+        ),
+    ]
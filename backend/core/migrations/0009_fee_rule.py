@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:47
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_airport_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origin', models.CharField(blank=True, default='', help_text='Origin IATA code, blank for any origin.', max_length=3)),
+                ('destination', models.CharField(blank=True, default='', help_text='Destination IATA code, blank for any destination.', max_length=3)),
+                ('airline', models.CharField(blank=True, default='', help_text='Airline designator (first two characters of the flight number), blank for any airline.', max_length=2)),
+                ('rate', models.FloatField(help_text='Fraction of the fare, e.g. 0.10 for 10%.', validators=[django.core.validators.MinValueValidator(0)])),
+                ('minimum_fee', models.FloatField(help_text='Lowest fee charged, in the fare currency.', validators=[django.core.validators.MinValueValidator(0)])),
+                ('active', models.BooleanField(default=True)),
+                ('description', models.CharField(blank=True, max_length=200)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['origin', 'destination', 'airline'],
+                'constraints': [models.UniqueConstraint(fields=('origin', 'destination', 'airline'), name='fee_rule_scope_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_fee_rule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=200, unique=True)),
+                ('tokens', models.FloatField()),
+                ('updated_at', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='rate_limit_updated_idx')],
+            },
+        ),
+    ]
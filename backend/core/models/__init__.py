@@ -1,6 +1,11 @@
 """Models package for the core application."""
 from .airport_model import Airport
+from .airport_change_model import AirportChange
+from .airport_tombstone_model import AirportTombstone
+from .fare_observation_model import FareObservation
+from .fee_rule_model import FeeRule
 from .import_log_model import ImportLogModel
 from .log_model import ApplicationLog
+from .rate_limit_bucket_model import RateLimitBucket
 
-__all__ = ['Airport', 'ImportLogModel', 'ApplicationLog']
+__all__ = ['Airport', 'AirportChange', 'AirportTombstone', 'FareObservation', 'FeeRule', 'ImportLogModel', 'ApplicationLog', 'RateLimitBucket']
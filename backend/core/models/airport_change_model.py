@@ -0,0 +1,26 @@
+from django.db.models import Model, TextChoices, CharField, DateTimeField, ForeignKey, Index, JSONField, CASCADE
+from django.utils import timezone
+
+
+class AirportChange(Model):
+    """Field-level diff of one airport produced by one import run."""
+
+    class ChangeType(TextChoices):
+        CREATED = 'CREATED', 'Created'
+        UPDATED = 'UPDATED', 'Updated'
+        DELETED = 'DELETED', 'Deleted'
+
+    import_log = ForeignKey('core.ImportLogModel', on_delete=CASCADE, related_name='airport_changes')
+    iata = CharField(max_length=3)
+    change_type = CharField(max_length=10, choices=ChangeType.choices)
+    changes = JSONField(default=dict, help_text="Changed fields as {field: [old, new]}.")
+    changed_at = DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-changed_at', '-id']
+        indexes = [
+            Index(fields=['iata', '-changed_at'], name='airport_change_iata_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.iata} {self.change_type} in import #{self.import_log_id}"
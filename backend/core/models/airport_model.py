@@ -1,4 +1,4 @@
-from django.db.models import Model, CharField, FloatField, DateTimeField
+from django.db.models import Model, CharField, FloatField, DateTimeField, Index
 
 class Airport(Model):
     state = CharField(max_length=2)
@@ -12,6 +12,10 @@ class Airport(Model):
     class Meta:
         ordering = ['iata']
         verbose_name = 'Airport'
+        indexes = [
+            # Delta sync: airports created or updated after a cursor
+            Index(fields=['modified_on', 'id'], name='airport_modified_idx'),
+        ]
 
     def __str__(self):
         return f"{self.city} ({self.iata})"
\ No newline at end of file
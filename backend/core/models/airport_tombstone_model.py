@@ -0,0 +1,18 @@
+from django.db.models import Model, CharField, DateTimeField, Index
+from django.utils import timezone
+
+
+class AirportTombstone(Model):
+    """Marks a deleted airport so delta sync clients can drop it. Removed if the airport comes back."""
+
+    iata = CharField(max_length=3, unique=True)
+    deleted_at = DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            Index(fields=['deleted_at'], name='airport_tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.iata} deleted at {self.deleted_at.isoformat()}"
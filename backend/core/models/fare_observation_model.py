@@ -0,0 +1,26 @@
+from django.db.models import Model, CharField, DateField, DateTimeField, FloatField, Index
+from django.utils import timezone
+
+
+class FareObservation(Model):
+    """
+    Append-only record of a fare returned by the Mock Airlines API for one leg.
+    Kept narrow on purpose (no FKs, no JSON) since every upstream search writes a row per option.
+    """
+    origin = CharField(max_length=3)
+    destination = CharField(max_length=3)
+    departure_date = DateField()
+    flight_number = CharField(max_length=16, blank=True)
+    fare = FloatField()
+    fetched_at = DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # "cheapest seen for route X over the last N days"
+            Index(fields=['origin', 'destination', 'fetched_at'], name='fare_route_fetched_idx'),
+            # latest fares for a route and travel date (cache pre-population)
+            Index(fields=['origin', 'destination', 'departure_date', 'fetched_at'], name='fare_route_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.origin}->{self.destination} {self.departure_date} {self.flight_number}: {self.fare}"
@@ -0,0 +1,37 @@
+from django.core.validators import MinValueValidator
+from django.db.models import Model, BooleanField, CharField, DateTimeField, FloatField, UniqueConstraint
+
+
+class FeeRule(Model):
+    """
+    Service fee for a route and/or airline; blank fields match anything. The most specific active
+    rule wins (see core/utils/fee_schedule_utils.py); with no rule at all the default fee applies.
+    """
+
+    origin = CharField(max_length=3, blank=True, default='', help_text="Origin IATA code, blank for any origin.")
+    destination = CharField(max_length=3, blank=True, default='', help_text="Destination IATA code, blank for any destination.")
+    airline = CharField(
+        max_length=2, blank=True, default='',
+        help_text="Airline designator (first two characters of the flight number), blank for any airline.",
+    )
+    rate = FloatField(validators=[MinValueValidator(0)], help_text="Fraction of the fare, e.g. 0.10 for 10%.")
+    minimum_fee = FloatField(validators=[MinValueValidator(0)], help_text="Lowest fee charged, in the fare currency.")
+    active = BooleanField(default=True)
+    description = CharField(max_length=200, blank=True)
+    updated_at = DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['origin', 'destination', 'airline']
+        constraints = [
+            UniqueConstraint(fields=['origin', 'destination', 'airline'], name='fee_rule_scope_unique'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.origin = self.origin.strip().upper()
+        self.destination = self.destination.strip().upper()
+        self.airline = self.airline.strip().upper()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        scope = f"{self.origin or '*'}->{self.destination or '*'} {self.airline or '*'}"
+        return f"{scope}: {self.rate:.2%} (min {self.minimum_fee:.2f})"
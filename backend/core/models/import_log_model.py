@@ -1,4 +1,4 @@
-from django.db.models import Model, TextChoices ,DateTimeField, CharField, PositiveIntegerField, TextField, JSONField
+from django.db.models import Model, TextChoices ,DateTimeField, CharField, PositiveIntegerField, TextField, JSONField, Index
 
 class ImportLogModel(Model):
     class Status(TextChoices):
@@ -11,14 +11,22 @@ class ImportLogModel(Model):
     
     airports_created = PositiveIntegerField(default=0)
     airports_updated = PositiveIntegerField(default=0)
+    airports_rejected = PositiveIntegerField(default=0)
+    airports_deleted = PositiveIntegerField(default=0)
 
     created_iatas = JSONField(default=list, help_text="List of IATA codes for newly created airports.")
     updated_iatas = JSONField(default=list, help_text="List of IATA codes for updated airports.")
+    deleted_iatas = JSONField(default=list, help_text="List of IATA codes of airports removed because they left the feed.")
+    rejected_records = JSONField(default=list, help_text="Feed records rejected by validation, with the reasons.")
     
     details = TextField(blank=True, help_text="Contains error messages or other details.")
 
     class Meta:
         ordering = ['-start_time']
+        indexes = [
+            # Keyset pagination of the import history
+            Index(fields=['-start_time', '-id'], name='import_log_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"Import run on {self.start_time.strftime('%Y-%m-%d %H:%M:%S')} - {self.status}"
\ No newline at end of file
@@ -13,15 +13,17 @@ class ApplicationLog(models.Model):
         CRITICAL = 'CRITICAL', 'Critical'
     
     timestamp = models.DateTimeField(default=timezone.now, db_index=True)
-    level = models.CharField(max_length=10, choices=LogLevel.choices, db_index=True)
+    level = models.CharField(max_length=10, choices=LogLevel.choices)
     module = models.CharField(max_length=255, help_text="Module or file where the log originated")
     message = models.TextField()
     extra_data = models.JSONField(null=True, blank=True, help_text="Additional context data")
     
     class Meta:
         ordering = ['-timestamp']
+        # Every log write maintains these, so keep only what queries use: `timestamp` (listing and
+        # date ranges, search popularity windows) and LogsView filtered by level, newest first
         indexes = [
-            models.Index(fields=['-timestamp', 'level']),
+            models.Index(fields=['level', '-timestamp'], name='applog_level_ts_idx'),
         ]
     
     def __str__(self):
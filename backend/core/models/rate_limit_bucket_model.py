@@ -0,0 +1,22 @@
+from django.db.models import Model, CharField, FloatField, Index
+
+
+class RateLimitBucket(Model):
+    """
+    Token bucket of one client for one rate-limit scope, shared by every worker through the database.
+    Updated with a single conditional UPDATE (see core/utils/rate_limit_utils.py).
+    """
+
+    key = CharField(max_length=200, unique=True)
+    tokens = FloatField()
+    # Unix time of the last refill; a float keeps the refill arithmetic inside the UPDATE
+    updated_at = FloatField()
+
+    class Meta:
+        indexes = [
+            # purge of buckets idle long enough to be full again
+            Index(fields=['updated_at'], name='rate_limit_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key}: {self.tokens:.2f} tokens"
@@ -1,8 +1,12 @@
 from django.urls import path
-from core.views.airport_views import AirportImportView, AirportDetailView, AirportListView
+from core.views.airport_views import AirportChangesView, AirportImportView, AirportDetailView, AirportListView, AirportSyncView, AirportAutocompleteView
 
 urlpatterns = [
     path('airports/import/', AirportImportView.as_view(), name='airport-import'),
     path('airports/', AirportListView.as_view(), name='airport-list'),
+    # Before the detail route, which would otherwise match "sync"/"autocomplete" as an IATA code
+    path('airports/sync/', AirportSyncView.as_view(), name='airport-sync'),
+    path('airports/autocomplete/', AirportAutocompleteView.as_view(), name='airport-autocomplete'),
     path('airports/<str:iata>/', AirportDetailView.as_view(), name='airport-detail'),
+    path('airports/<str:iata>/changes/', AirportChangesView.as_view(), name='airport-changes'),
 ]
@@ -1,7 +1,9 @@
 from django.urls import path
-from core.views.flights_search_views import FlightSearchView
+from core.views.flights_search_views import FarePriceHistoryView, FlightBatchSearchView, FlightSearchView
 
 
 urlpatterns = [
     path('search/', FlightSearchView.as_view(), name='flight-search'),
+    path('search/batch/', FlightBatchSearchView.as_view(), name='flight-search-batch'),
+    path('price-history/', FarePriceHistoryView.as_view(), name='fare-price-history'),
 ]
\ No newline at end of file
@@ -1,8 +1,9 @@
 from django.urls import path
-from core.views.import_log_views import ImportLogListView, ImportLogDetailView
+from core.views.import_log_views import ImportLogChangesView, ImportLogListView, ImportLogDetailView
 
 
 urlpatterns = [
     path('import-logs/', ImportLogListView.as_view(), name='import-log-list'),
     path('import-logs/<int:id>/', ImportLogDetailView.as_view(), name='import-log-detail'),
+    path('import-logs/<int:id>/changes/', ImportLogChangesView.as_view(), name='import-log-changes'),
 ]
\ No newline at end of file
@@ -0,0 +1,6 @@
+from django.urls import path
+from core.views.metrics_views import MetricsView
+
+urlpatterns = [
+    path('metrics', MetricsView.as_view(), name='metrics'),
+]
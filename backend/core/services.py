@@ -1,15 +1,32 @@
 import os
-import requests
-from requests.auth import HTTPBasicAuth
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.db import connections, transaction
 from django.utils import timezone
 
 import datetime
+import functools
 import math
-from typing import Dict, Any, List
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence
 
+from .models.airport_change_model import AirportChange
 from .models.airport_model import Airport
+from .models.airport_tombstone_model import AirportTombstone
 from .models.import_log_model import ImportLogModel
+from .models.log_model import ApplicationLog
+from .signals import bulk_airport_write
+from .utils.airport_index_utils import get_airport_index, invalidate_airport_index
+from .utils.airport_record_utils import normalize_airport_records
+from .utils.fare_history_utils import record_fare_observations
+from .utils.fee_schedule_utils import DEFAULT_FEE, DEFAULT_ROUTE_FEES, Fee, RouteFees, route_fees
 from .utils.logging_utils import log_warning, log_error
+from .utils.search_cache_utils import get_or_refresh_search, is_search_fresh, route_tier, search_cache_key, store_search_result
+from .utils.timing_utils import timed_phase
+
+if TYPE_CHECKING:
+    import requests
 
 
 MOCK_API_KEY = os.getenv("MOCK_API_KEY", "demo_key")
@@ -17,8 +34,133 @@ MOCK_API_BASE_URL = os.getenv("MOCK_API_BASE_URL")
 MOCK_API_USER = os.getenv("MOCK_API_USER", "demo")
 MOCK_API_PASSWORD = os.getenv("MOCK_API_PASSWORD", "swnvlD")
 EARTH_RADIUS_KM = 6371.0
+# Upstream connections kept alive per host; should be >= the batch search concurrency
+MOCK_API_POOL_SIZE = int(os.getenv("MOCK_API_POOL_SIZE", "16"))
+FLIGHT_BATCH_CONCURRENCY = int(os.getenv("FLIGHT_BATCH_CONCURRENCY", "8"))
+FLIGHT_BATCH_MAX_SIZE = int(os.getenv("FLIGHT_BATCH_MAX_SIZE", "5000"))
+# Batches sent over HTTP must finish within the gunicorn worker timeout; larger ones go through
+# the batch_search_flights command
+FLIGHT_BATCH_HTTP_MAX_SIZE = int(os.getenv("FLIGHT_BATCH_HTTP_MAX_SIZE", "200"))
+FLIGHT_SEARCH_LOG_MESSAGE = "Flight search"
+
+# Airport fields compared (and recorded in AirportChange) on every import
+AIRPORT_DIFF_FIELDS = ('state', 'city', 'lat', 'lon')
+AIRPORT_WRITE_BATCH_SIZE = 500
+AIRPORT_IMPORT_WORKERS = int(os.getenv("AIRPORT_IMPORT_WORKERS", "1"))
+# Rejected rows kept on the ImportLogModel (the count is always exact)
+IMPORT_REJECTED_RECORDS_LIMIT = 1000
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _requests():
+    # requests (with urllib3, certifi and idna) is most of this module's import time, so it is
+    # loaded on the first upstream call instead of on worker boot, migrate and every manage.py run
+    import requests
+    return requests
+
+def __getattr__(name):
+    # Keeps `core.services.requests` reachable (e.g. patch('core.services.requests.get'))
+    if name == 'requests':
+        return _requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def apply_airport_records(
+    log_entry: ImportLogModel,
+    records: Mapping[str, Mapping[str, Any]],
+    keep: Iterable[str] = ()
+):
+    """
+    Writes a feed snapshot (IATA -> field values) against the airports already stored.
+    The stored airports are loaded in one query and diffed in memory with set operations;
+    only new or changed airports are written, in bulk and in one transaction, together with
+    one AirportChange row each. Stored airports missing from the snapshot are deleted (leaving
+    a tombstone for delta sync), except the codes in `keep` (rows the feed still lists but that
+    failed validation). Returns the created, updated and deleted IATA lists.
+    """
+    existing = {airport.iata: airport for airport in Airport.objects.all()}
+    now = timezone.now()
+
+    # An empty snapshot is far more likely a broken feed than every airport closing
+    deleted_iatas = sorted(existing.keys() - records.keys() - set(keep)) if records else []
+
+    new_airports = [Airport(iata=iata, **records[iata]) for iata in sorted(records.keys() - existing.keys())]
+    change_rows = [
+        AirportChange(
+            import_log=log_entry,
+            iata=airport.iata,
+            change_type=AirportChange.ChangeType.CREATED,
+            changes={field: [None, getattr(airport, field)] for field in AIRPORT_DIFF_FIELDS},
+            changed_at=now,
+        )
+        for airport in new_airports
+    ]
+
+    changed_airports = []
+    for iata in sorted(records.keys() & existing.keys()):
+        airport, values = existing[iata], records[iata]
+        diff = {
+            field: [getattr(airport, field), values[field]]
+            for field in AIRPORT_DIFF_FIELDS
+            if getattr(airport, field) != values[field]
+        }
+        if not diff:
+            continue
+        for field, (_, new_value) in diff.items():
+            setattr(airport, field, new_value)
+        # bulk_update() skips auto_now, so modified_on is set by hand
+        airport.modified_on = now
+        changed_airports.append(airport)
+        change_rows.append(AirportChange(
+            import_log=log_entry,
+            iata=iata,
+            change_type=AirportChange.ChangeType.UPDATED,
+            changes=diff,
+            changed_at=now,
+        ))
+
+    change_rows.extend(
+        AirportChange(
+            import_log=log_entry,
+            iata=iata,
+            change_type=AirportChange.ChangeType.DELETED,
+            changes={field: [getattr(existing[iata], field), None] for field in AIRPORT_DIFF_FIELDS},
+            changed_at=now,
+        )
+        for iata in deleted_iatas
+    )
 
-def import_airports_from_api(user=None, password=None):
+    with transaction.atomic():
+        Airport.objects.bulk_create(new_airports, batch_size=AIRPORT_WRITE_BATCH_SIZE)
+        Airport.objects.bulk_update(changed_airports, [*AIRPORT_DIFF_FIELDS, 'modified_on'], batch_size=AIRPORT_WRITE_BATCH_SIZE)
+        if new_airports:
+            # bulk_create() sends no post_save, so returning airports are un-tombstoned here
+            AirportTombstone.objects.filter(iata__in=[airport.iata for airport in new_airports]).delete()
+        if deleted_iatas:
+            AirportTombstone.objects.bulk_create(
+                [AirportTombstone(iata=iata, deleted_at=now) for iata in deleted_iatas],
+                batch_size=AIRPORT_WRITE_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['iata'],
+                update_fields=['deleted_at'],
+            )
+            # The per-row post_delete handler would write each tombstone and invalidate the index again
+            with bulk_airport_write():
+                Airport.objects.filter(iata__in=deleted_iatas).delete()
+        AirportChange.objects.bulk_create(change_rows, batch_size=AIRPORT_WRITE_BATCH_SIZE)
+
+    if new_airports or changed_airports or deleted_iatas:
+        invalidate_airport_index()
+    return [airport.iata for airport in new_airports], [airport.iata for airport in changed_airports], deleted_iatas
+
+def import_airports_from_api(user=None, password=None, workers=None):
+    """
+    Imports the airport feed. With `workers` > 1 (default AIRPORT_IMPORT_WORKERS) records are
+    normalized in a process pool, sharded by IATA prefix; writes always go through one batched writer.
+    """
+    requests = _requests()
+    workers = workers or AIRPORT_IMPORT_WORKERS
 
     api_url = os.getenv("AIRPORT_DATA_URL")
     if user and password:
@@ -35,39 +177,35 @@ def import_airports_from_api(user=None, password=None):
 
     created_iata_list = []
     updated_iata_list = []
+    deleted_iata_list = []
+    rejected_records = []
 
     try:
-        response = requests.get(api_url, auth=HTTPBasicAuth(api_user, api_password), timeout=30)
+        response = requests.get(api_url, auth=requests.auth.HTTPBasicAuth(api_user, api_password), timeout=30)
         response.raise_for_status()
         
         data = response.json()
-        airports_in_api = []
-
-        for airport_data in data.values():
-            iata_code = airport_data.get('iata')
-            if not iata_code:
-                continue
-            
-            airports_in_api.append(iata_code)
-
-            # Create new airport or update existing one based on IATA code
-            obj, created = Airport.objects.update_or_create(
-                iata=iata_code,
-                defaults={
-                    'state': airport_data.get('state'),
-                    'city': airport_data.get('city'),
-                    'lat': airport_data.get('lat'),
-                    'lon': airport_data.get('lon'),
-                }
-            )
-            
-            if created:
-                created_iata_list.append(iata_code)
-            else:
-                updated_iata_list.append(iata_code)
+        # Bad rows are quarantined here, before anything is written
+        records, rejected_records = normalize_airport_records(list(data.items()), workers=workers)
+        if rejected_records:
+            log_warning('core.services', f"{len(rejected_records)} airport records rejected by validation", {
+                'rejected': len(rejected_records),
+                'sample': rejected_records[:5],
+            })
+
+        rejected_iatas = {
+            rejected['record']['iata'].strip().upper()
+            for rejected in rejected_records
+            if isinstance(rejected['record'], Mapping) and isinstance(rejected['record'].get('iata'), str)
+        }
+        created_iata_list, updated_iata_list, deleted_iata_list = apply_airport_records(log_entry, records, keep=rejected_iatas)
+        unchanged = len(records) - len(created_iata_list) - len(updated_iata_list)
 
         log_entry.status = ImportLogModel.Status.SUCCESS
-        log_entry.details = f"Successfully processed {len(data)} airports."
+        log_entry.details = (
+            f"Successfully processed {len(data)} airports "
+            f"({unchanged} unchanged, {len(rejected_records)} rejected, {len(deleted_iata_list)} deleted, {workers} worker(s))."
+        )
 
     except requests.exceptions.RequestException as e:
         log_entry.details = f"Failed to fetch data from API: {str(e)}"
@@ -82,15 +220,29 @@ def import_airports_from_api(user=None, password=None):
         log_entry.airports_updated = len(updated_iata_list)
         log_entry.created_iatas = created_iata_list
         log_entry.updated_iatas = updated_iata_list
+        log_entry.airports_deleted = len(deleted_iata_list)
+        log_entry.deleted_iatas = deleted_iata_list
+        log_entry.airports_rejected = len(rejected_records)
+        log_entry.rejected_records = rejected_records[:IMPORT_REJECTED_RECORDS_LIMIT]
         log_entry.end_time = timezone.now()
         log_entry.save()
 
+    if log_entry.status == ImportLogModel.Status.SUCCESS:
+        try:
+            # Rebuild the index (autocomplete, search lookups) now rather than on the next request
+            get_airport_index()
+        except Exception as e:
+            log_warning('core.services', f"Airport index rebuild after import failed: {str(e)}", {'error': str(e)})
+
     return {
         "status": log_entry.status,
         "created": log_entry.airports_created,
         "updated": log_entry.airports_updated,
         "created_iatas": created_iata_list,
         "updated_iatas": updated_iata_list,
+        "deleted": log_entry.airports_deleted,
+        "deleted_iatas": deleted_iata_list,
+        "rejected": log_entry.airports_rejected,
         "details": log_entry.details
     }
 
@@ -107,9 +259,9 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     distance = EARTH_RADIUS_KM * c
     return distance
 
-def calculate_price(fare: float) -> Dict[str, float]:
-    # Fee is 10% of fare with a minimum of R$40
-    fee = max(fare * 0.10, 40.0)
+def calculate_price(fare: float, fee_rule: Fee = DEFAULT_FEE) -> Dict[str, float]:
+    # Fee is a share of the fare with a minimum (by default 10% and R$40, see FeeRule)
+    fee = max(fare * fee_rule.rate, fee_rule.minimum)
     total = fare + fee
     return {
         "fare": round(fare, 2),
@@ -136,36 +288,105 @@ def calculate_meta(flight: Dict[str, Any], distance: float) -> Dict[str, Any]:
         "cost_per_km": round(cost_per_km, 2)
     }
 
+def get_http_session() -> 'requests.Session':
+    """Process-wide session so upstream calls reuse pooled keep-alive connections."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                requests = _requests()
+                session = requests.Session()
+                session.auth = requests.auth.HTTPBasicAuth(MOCK_API_USER, MOCK_API_PASSWORD)
+                adapter = requests.adapters.HTTPAdapter(pool_connections=MOCK_API_POOL_SIZE, pool_maxsize=MOCK_API_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
 def fetch_flights_from_api(departure_airport: str, arrival_airport: str, date: str) -> Dict[str, Any]:
+    requests = _requests()
     url = f"{MOCK_API_BASE_URL}/{MOCK_API_KEY}/{departure_airport}/{arrival_airport}/{date}"
     try:
-        response = requests.get(
-            url,
-            auth=HTTPBasicAuth(MOCK_API_USER, MOCK_API_PASSWORD),
-            timeout=15
-        )
-        response.raise_for_status()
-        return response.json()
+        with timed_phase("upstream", f"{departure_airport}-{arrival_airport} {date}"):
+            response = get_http_session().get(url, timeout=15)
+            response.raise_for_status()
+            return response.json()
     except requests.exceptions.RequestException as e:
         log_warning('core.services', f"Error fetching data from Mock Airlines API: {str(e)}", {'url': url, 'error': str(e)})
         raise ConnectionError(f"Error fetching data from Mock Airlines API: {e}") from e
 
-def process_flight_options(api_response: Dict[str, Any], distance: float) -> List[Dict[str, Any]]:
-    processed_flights = []
-    for flight in api_response.get("options", []):
-        raw_fare = flight.get("price", {}).get("fare", 0.0)
-        # Recalculate price with fees and add flight metadata
-        flight["price"] = calculate_price(raw_fare)
-        flight["meta"] = calculate_meta(flight, distance)
-        processed_flights.append(flight)
-    return processed_flights
+class EnrichedFlightOption(NamedTuple):
+    """A priced upstream flight option. The upstream dict is kept as is and never mutated."""
+    source: Mapping[str, Any]
+    fare: float
+    fee: float
+    total: float
+    range: int
+    cruise_speed_kmh: int
+    cost_per_km: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **self.source,
+            "price": {"fare": self.fare, "fee": self.fee, "total": self.total},
+            "meta": {"range": self.range, "cruise_speed_kmh": self.cruise_speed_kmh, "cost_per_km": self.cost_per_km},
+        }
+
+@functools.lru_cache(maxsize=8192)
+def _iso_to_epoch(value: str) -> float:
+    # Options of a bulk quote share a handful of departure/arrival slots, so each string is parsed once
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+def enrich_flight_options(
+    options: Sequence[Mapping[str, Any]],
+    distance: float,
+    fees: RouteFees = DEFAULT_ROUTE_FEES
+) -> List[EnrichedFlightOption]:
+    """
+    Prices every option of a leg, with the same results as calculate_price/calculate_meta applied
+    to each option. `fees` are the leg's compiled fee rules (route_fees); the default schedule
+    applies without them.
+    """
+    enriched = []
+    for option in options:
+        raw_fare = option.get("price", {}).get("fare", 0.0)
+        fee_rule = fees.for_option(option)
+        raw_fee = max(raw_fare * fee_rule.rate, fee_rule.minimum)
+        fare = round(raw_fare, 2)
+
+        if distance == 0:
+            flight_range, cruise_speed_kmh, cost_per_km = 0, 0, 0.0
+        else:
+            duration_in_hours = (_iso_to_epoch(option["arrival_time"]) - _iso_to_epoch(option["departure_time"])) / 3600
+            flight_range = round(distance)
+            cruise_speed_kmh = round(distance / duration_in_hours) if duration_in_hours > 0 else 0
+            cost_per_km = round(fare / distance, 2)
+
+        enriched.append(EnrichedFlightOption(
+            source=option,
+            fare=fare,
+            fee=round(raw_fee, 2),
+            total=round(raw_fare + raw_fee, 2),
+            range=flight_range,
+            cruise_speed_kmh=cruise_speed_kmh,
+            cost_per_km=cost_per_km,
+        ))
+    return enriched
 
 def find_flight_combinations(
     origin_iata: str,
     destination_iata: str,
     departure_date_str: str,
-    return_date_str: str
+    return_date_str: str,
+    airports: Optional[Mapping[str, Airport]] = None
 ) -> Dict[str, Any]:
+    """
+    `airports` is an optional IATA -> Airport mapping (upper-case keys) preloaded by the caller,
+    so batch searches don't query the database once per search.
+    """
 
     if not all([origin_iata, destination_iata, departure_date_str, return_date_str]):
         raise ValueError("Missing required search parameters.")
@@ -184,9 +405,17 @@ def find_flight_combinations(
         raise ValueError("Return date cannot be before the departure date.")
 
     try:
-        origin_airport = Airport.objects.get(iata__iexact=origin_iata)
-        destination_airport = Airport.objects.get(iata__iexact=destination_iata)
-    except Airport.DoesNotExist:
+        with timed_phase("airport_lookup"):
+            if airports is not None:
+                origin_airport = airports[origin_iata.upper()]
+                destination_airport = airports[destination_iata.upper()]
+            else:
+                # In-memory snapshot first; a code missing from it (e.g. imported by another worker
+                # since) falls back to the unique index, where IATA codes are stored upper-cased
+                indexed = get_airport_index().airports
+                origin_airport = indexed.get(origin_iata.upper()) or Airport.objects.get(iata=origin_iata.upper())
+                destination_airport = indexed.get(destination_iata.upper()) or Airport.objects.get(iata=destination_iata.upper())
+    except (Airport.DoesNotExist, KeyError):
         log_warning(
             'core.services',
             f"Airport lookup failed for origin={origin_iata} destination={destination_iata}",
@@ -199,29 +428,59 @@ def find_flight_combinations(
         destination_airport.lat, destination_airport.lon
     )
 
+    def search_upstream() -> Dict[str, Any]:
+        return build_flight_combinations(
+            origin_iata, destination_iata, departure_date_str, return_date_str, distance_km
+        )
+
+    # Serve from the stale-while-revalidate cache, hitting the upstream API only when needed
+    return get_or_refresh_search(
+        search_cache_key(origin_iata, destination_iata, departure_date_str, return_date_str),
+        route_tier(origin_iata, destination_iata),
+        search_upstream,
+    )
+
+def build_flight_combinations(
+    origin_iata: str,
+    destination_iata: str,
+    departure_date_str: str,
+    return_date_str: str,
+    distance_km: float
+) -> Dict[str, Any]:
     outbound_api_data = fetch_flights_from_api(origin_iata, destination_iata, departure_date_str)
-    outbound_flights = process_flight_options(outbound_api_data, distance_km)
-    print(outbound_flights)
+    record_fare_observations(origin_iata, destination_iata, departure_date_str, outbound_api_data.get("options", []))
+    with timed_phase("enrich", "outbound"):
+        outbound_options = enrich_flight_options(
+            outbound_api_data.get("options", []), distance_km, route_fees(origin_iata, destination_iata)
+        )
+        outbound_flights = [option.as_dict() for option in outbound_options]
 
     inbound_api_data = fetch_flights_from_api(destination_iata, origin_iata, return_date_str)
-    inbound_flights = process_flight_options(inbound_api_data, distance_km)
-    print(inbound_flights)
-
-    flight_combinations = []
-    for outbound_flight in outbound_flights:
-        for inbound_flight in inbound_flights:
-            total_price = outbound_flight['price']['total'] + inbound_flight['price']['total']
-            combination = {
-                "outbound_flight": outbound_flight,
-                "inbound_flight": inbound_flight,
-                "price": {
-                    "total": round(total_price, 2),
-                    "currency": outbound_api_data.get("summary", {}).get("currency", "BRL")
-                }
+    record_fare_observations(destination_iata, origin_iata, return_date_str, inbound_api_data.get("options", []))
+    with timed_phase("enrich", "inbound"):
+        inbound_options = enrich_flight_options(
+            inbound_api_data.get("options", []), distance_km, route_fees(destination_iata, origin_iata)
+        )
+        inbound_flights = [option.as_dict() for option in inbound_options]
+
+    currency = outbound_api_data.get("summary", {}).get("currency", "BRL")
+    with timed_phase("combine"):
+        combination_totals = [
+            round(outbound_option.total + inbound_option.total, 2)
+            for outbound_option in outbound_options
+            for inbound_option in inbound_options
+        ]
+        # Sort by total price (cheapest first) on the precomputed totals, keeping upstream order on ties
+        order = sorted(range(len(combination_totals)), key=combination_totals.__getitem__)
+        inbound_count = len(inbound_flights)
+        flight_combinations = [
+            {
+                "outbound_flight": outbound_flights[index // inbound_count],
+                "inbound_flight": inbound_flights[index % inbound_count],
+                "price": {"total": combination_totals[index], "currency": currency}
             }
-            flight_combinations.append(combination)
-    # Sort combinations by total price (lambda sorts lower price first by the use of magic), get is used to avoid KeyError in lambda function
-    flight_combinations.sort(key=lambda x: x.get('price', {}).get('total', float('inf')))
+            for index in order
+        ]
     return {
         "summary": {
             "from": origin_iata.upper(),
@@ -235,4 +494,153 @@ def find_flight_combinations(
         "outbound_options": outbound_flights,
         "inbound_options": inbound_flights,
         "combinations": flight_combinations
-    }
\ No newline at end of file
+    }
+
+
+def _search_batch_item(index: int, query: Mapping[str, Any], airports: Mapping[str, Airport]) -> Dict[str, Any]:
+    line = {"index": index, "query": dict(query)}
+    try:
+        line["status"] = 200
+        line["result"] = find_flight_combinations(
+            origin_iata=query.get("from"),
+            destination_iata=query.get("to"),
+            departure_date_str=query.get("departureDate"),
+            return_date_str=query.get("returnDate"),
+            airports=airports,
+        )
+    except ValueError as e:
+        line["status"], line["error"] = 400, str(e)
+    except ConnectionError as e:
+        line["status"], line["error"] = 503, f"External API Error: {str(e)}"
+    except Exception as e:
+        log_error('core.services', f"Unhandled exception in batch flight search: {str(e)}", {'query': dict(query), 'error': str(e)})
+        line["status"], line["error"] = 500, "An unexpected internal server error occurred."
+    finally:
+        # Worker threads open their own connections (cache refreshes, logging); don't leak them
+        connections.close_all()
+    return line
+
+def search_flights_batch(
+    queries: Sequence[Mapping[str, Any]],
+    concurrency: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Runs many flight searches with a bounded worker pool and returns an iterator of result lines,
+    in completion order (each line carries the query `index`). Airports are loaded once for the
+    whole batch and every worker shares the pooled upstream HTTP session.
+    """
+    if len(queries) > FLIGHT_BATCH_MAX_SIZE:
+        raise ValueError(f"A batch can hold at most {FLIGHT_BATCH_MAX_SIZE} searches.")
+    if any(not isinstance(query, Mapping) for query in queries):
+        raise ValueError("Each search must be an object with from, to, departureDate and returnDate.")
+    concurrency = max(1, min(concurrency or FLIGHT_BATCH_CONCURRENCY, MOCK_API_POOL_SIZE))
+
+    codes = {
+        str(code).upper()
+        for query in queries
+        for code in (query.get("from"), query.get("to"))
+        if code
+    }
+    airports = {airport.iata.upper(): airport for airport in Airport.objects.filter(iata__in=codes)}
+    return _run_flight_batch(queries, airports, concurrency)
+
+def _run_flight_batch(
+    queries: Sequence[Mapping[str, Any]],
+    airports: Mapping[str, Airport],
+    concurrency: int
+) -> Iterator[Dict[str, Any]]:
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="flight-batch") as executor:
+        in_flight = set()
+        for index, query in enumerate(queries):
+            # Keep at most 2x concurrency searches queued so huge batches don't pile up results in memory
+            if len(in_flight) >= concurrency * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            in_flight.add(executor.submit(_search_batch_item, index, query, airports))
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def rank_popular_searches(since_hours: int = 24, limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    Ranks the searches made through FlightSearchView (logged as ApplicationLog entries) by how
+    often they were made in the last `since_hours` hours. Searches departing in the past are skipped.
+    """
+    since = timezone.now() - datetime.timedelta(hours=since_hours)
+    entries = ApplicationLog.objects.filter(
+        module='core.views.flights_search_views',
+        message=FLIGHT_SEARCH_LOG_MESSAGE,
+        timestamp__gte=since,
+    ).values_list('extra_data', flat=True)
+
+    today = datetime.date.today().isoformat()
+    counts = Counter(
+        (data['origin'], data['destination'], data['departure_date'], data['return_date'])
+        for data in entries.iterator()
+        if data and data.get('departure_date', '') >= today
+    )
+    return [
+        {"from": origin, "to": destination, "departureDate": departure, "returnDate": ret, "hits": hits}
+        for (origin, destination, departure, ret), hits in counts.most_common(limit)
+    ]
+
+def warm_flight_search_cache(
+    searches: Sequence[Mapping[str, Any]],
+    calls_per_minute: int = 60,
+    max_calls: Optional[int] = None,
+    sleep=time.sleep
+) -> List[Dict[str, Any]]:
+    """
+    Pre-fetches searches into the flight search cache, in the given order, through the upstream API.
+    Each search costs two upstream calls; calls are spaced to stay under `calls_per_minute` and
+    warming stops once `max_calls` would be exceeded. Entries that are still fresh are left alone.
+    Returns one report row per search with the cache key and what happened to it.
+    """
+    if calls_per_minute < 1:
+        raise ValueError("calls_per_minute must be at least 1.")
+    call_interval = 60.0 / calls_per_minute
+    codes = {str(code).upper() for search in searches for code in (search["from"], search["to"])}
+    airports = {airport.iata.upper(): airport for airport in Airport.objects.filter(iata__in=codes)}
+
+    report = []
+    calls_made = 0
+    next_call_at = time.monotonic()
+    for search in searches:
+        origin, destination = search["from"].upper(), search["to"].upper()
+        key = search_cache_key(origin, destination, search["departureDate"], search["returnDate"])
+        row = {"key": key, "hits": search.get("hits")}
+        report.append(row)
+
+        tier = route_tier(origin, destination, count_hit=False)
+        if is_search_fresh(key, tier):
+            row["status"] = "fresh"
+            continue
+        if origin not in airports or destination not in airports:
+            row["status"] = "unknown-airport"
+            continue
+        if max_calls is not None and calls_made + 2 > max_calls:
+            row["status"] = "over-budget"
+            continue
+
+        wait_seconds = next_call_at - time.monotonic()
+        if wait_seconds > 0:
+            sleep(wait_seconds)
+        next_call_at = max(next_call_at, time.monotonic()) + 2 * call_interval
+        calls_made += 2
+
+        distance_km = calculate_distance(
+            airports[origin].lat, airports[origin].lon,
+            airports[destination].lat, airports[destination].lon
+        )
+        try:
+            result = build_flight_combinations(origin, destination, search["departureDate"], search["returnDate"], distance_km)
+        except ConnectionError as e:
+            row["status"], row["error"] = "failed", str(e)
+            continue
+        store_search_result(key, result, tier)
+        row["status"] = "warmed"
+
+    return report
@@ -0,0 +1,55 @@
+import contextlib
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django.utils import timezone
+
+from core.models.airport_model import Airport
+from core.models.airport_tombstone_model import AirportTombstone
+from core.models.fee_rule_model import FeeRule
+from core.utils.airport_index_utils import invalidate_airport_index
+from core.utils.fee_schedule_utils import invalidate_fee_schedule
+
+
+_bulk_airport_write: ContextVar[bool] = ContextVar('bulk_airport_write', default=False)
+
+
+@contextlib.contextmanager
+def bulk_airport_write():
+    """
+    For bulk airport writers (the importer): inside this block the per-row handlers below do nothing,
+    and the writer writes the tombstones in bulk and invalidates the airport index once itself.
+    """
+    token = _bulk_airport_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_airport_write.reset(token)
+
+
+@receiver(post_save, sender=Airport)
+def airport_saved(sender, instance, created, **kwargs):
+    # Bulk writes (the importer) don't send post_save and handle both steps themselves
+    if created:
+        AirportTombstone.objects.filter(iata=instance.iata).delete()
+    invalidate_airport_index()
+
+
+@receiver(post_delete, sender=Airport)
+def airport_deleted(sender, instance, **kwargs):
+    # Deletions from the admin or a shell leave a tombstone for delta sync clients
+    if _bulk_airport_write.get():
+        return
+    AirportTombstone.objects.update_or_create(iata=instance.iata, defaults={'deleted_at': timezone.now()})
+    invalidate_airport_index()
+
+
+@receiver(post_save, sender=FeeRule)
+@receiver(post_delete, sender=FeeRule)
+def fee_rule_changed(sender, instance, **kwargs):
+    # After commit, so no worker rebuilds the schedule from rows other connections can't see yet.
+    # Queryset.update() bypasses this; FEE_SCHEDULE_MAX_AGE_SECONDS picks such changes up
+    transaction.on_commit(invalidate_fee_schedule)
@@ -1,18 +1,44 @@
+import copy
 import datetime
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import patch
 import requests
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.db import connection
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
+from .models.airport_change_model import AirportChange
 from .models.airport_model import Airport
+from .models.airport_tombstone_model import AirportTombstone
+from .models.fare_observation_model import FareObservation
+from .models.fee_rule_model import FeeRule
 from .models.import_log_model import ImportLogModel
+from .models.log_model import ApplicationLog
+from .models.rate_limit_bucket_model import RateLimitBucket
 from .services import (
+    apply_airport_records,
     import_airports_from_api,
     calculate_distance,
     calculate_price,
     calculate_meta,
+    enrich_flight_options,
     find_flight_combinations,
+    rank_popular_searches,
+    search_flights_batch,
+    warm_flight_search_cache,
 )
+from .utils import fare_history_utils, search_cache_utils, timing_utils
+from .utils.airport_index_utils import get_airport_index, invalidate_airport_index
+from .utils.airport_record_utils import normalize_airport_records
+from .utils.fee_schedule_utils import DEFAULT_FEE, Fee, route_fees
+from .utils.startup_utils import migrate_if_needed, pending_migrations
 from core.views.flights_search_views import API_AUTH_TOKEN
+from import_airports.database import database_config
 
 
 class ModelAndImportTests(TestCase):
@@ -179,4 +205,827 @@ class FlightSearchViewTests(TestCase):
 
         r2 = self.client.get(self.url, self.valid_params, HTTP_AUTHORIZATION='Token bad')
         self.assertEqual(r2.status_code, 401)
-        print("[FlightSearchViewTests] end")
\ No newline at end of file
+        print("[FlightSearchViewTests] end")
+
+
+@patch('core.utils.fare_history_utils.FARE_HISTORY_ENABLED', False)
+class FlightSearchCacheTests(TestCase):
+    """
+    Stale-while-revalidate behaviour of find_flight_combinations.
+
+    Expected:
+    - A second identical search is served from cache without calling the upstream API.
+    - An entry past its fresh window is served as 'stale' and a background refresh is scheduled.
+    - When the upstream API is down, an old entry is served as 'stale-if-error' instead of failing.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Airport.objects.update_or_create(iata='POA', defaults={'city': 'POA', 'state': 'RS', 'lat': -30.03, 'lon': -51.23})
+        Airport.objects.update_or_create(iata='MAO', defaults={'city': 'MAO', 'state': 'AM', 'lat': -3.13, 'lon': -60.02})
+        today = datetime.date.today()
+        self.dates = ((today + datetime.timedelta(days=10)).isoformat(), (today + datetime.timedelta(days=15)).isoformat())
+        self.resp = {
+            'summary': {'currency': 'BRL'},
+            'options': [
+                {'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1200.0}},
+            ]
+        }
+
+    def _age_entry(self, seconds):
+        key = search_cache_utils.search_cache_key('POA', 'MAO', *self.dates)
+        entry = cache.get(key)
+        entry['cached_at'] -= seconds
+        cache.set(key, entry)
+
+    @patch('core.services.fetch_flights_from_api')
+    def test_fresh_stale_and_stale_if_error(self, mock_fetch):
+        print("[FlightSearchCacheTests] start")
+        mock_fetch.side_effect = lambda *args: self.resp
+
+        first = find_flight_combinations('POA', 'MAO', *self.dates)
+        second = find_flight_combinations('POA', 'MAO', *self.dates)
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(first['summary']['freshness'], 'fresh')
+        self.assertEqual(second['summary']['freshness'], 'fresh')
+
+        fresh_seconds, stale_seconds = search_cache_utils.STALENESS_BOUNDS['default']
+        self._age_entry(fresh_seconds + 1)
+        with patch('core.utils.search_cache_utils.schedule_refresh') as mock_refresh:
+            stale = find_flight_combinations('POA', 'MAO', *self.dates)
+        self.assertEqual(stale['summary']['freshness'], 'stale')
+        mock_refresh.assert_called_once()
+
+        self._age_entry(stale_seconds)
+        mock_fetch.side_effect = ConnectionError('upstream down')
+        fallback = find_flight_combinations('POA', 'MAO', *self.dates)
+        self.assertEqual(fallback['summary']['freshness'], 'stale-if-error')
+        self.assertEqual(fallback['summary']['total_combinations'], 1)
+        print("[FlightSearchCacheTests] end")
+
+
+
+class FlightEnrichmentTests(TestCase):
+    """
+    Batched enrichment of upstream flight options.
+
+    Expected:
+    - enrich_flight_options gives the same price/meta as calculate_price + calculate_meta per option.
+    - The upstream option dicts are left untouched.
+    """
+
+    def test_matches_per_option_helpers(self):
+        print("[FlightEnrichmentTests] start")
+        options = [
+            {'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1200.0}},
+            {'departure_time': '2025-12-20T12:00:00', 'arrival_time': '2025-12-20T12:00:00', 'price': {'fare': 150.555}},
+            {'departure_time': '2025-12-20T12:00:00-03:00', 'arrival_time': '2025-12-20T15:30:00-03:00', 'price': {'fare': 399.99}},
+        ]
+        snapshot = copy.deepcopy(options)
+
+        for distance in (3140.7, 0):
+            enriched = enrich_flight_options(options, distance)
+            for option, record in zip(options, enriched):
+                price = calculate_price(option['price']['fare'])
+                meta = calculate_meta({**option, 'price': price}, distance)
+                self.assertEqual(record.as_dict()['price'], price)
+                self.assertEqual(record.as_dict()['meta'], meta)
+
+        self.assertEqual(options, snapshot)
+        print("[FlightEnrichmentTests] end")
+
+
+
+@patch('core.utils.fare_history_utils.FARE_HISTORY_ENABLED', False)
+class FlightBatchSearchTests(TestCase):
+    """
+    Batch flight search (service and NDJSON endpoint).
+
+    Expected:
+    - Every query yields exactly one line carrying its index and a status (200 or 400 for invalid ones).
+    - The endpoint requires the token and streams application/x-ndjson.
+    - Batches above FLIGHT_BATCH_HTTP_MAX_SIZE are rejected with a 400 before any search runs.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Airport.objects.update_or_create(iata='POA', defaults={'city': 'POA', 'state': 'RS', 'lat': -30.03, 'lon': -51.23})
+        Airport.objects.update_or_create(iata='MAO', defaults={'city': 'MAO', 'state': 'AM', 'lat': -3.13, 'lon': -60.02})
+        today = datetime.date.today()
+        departure = (today + datetime.timedelta(days=10)).isoformat()
+        self.queries = [
+            {'from': 'POA', 'to': 'MAO', 'departureDate': departure, 'returnDate': (today + datetime.timedelta(days=12)).isoformat()},
+            {'from': 'MAO', 'to': 'POA', 'departureDate': departure, 'returnDate': (today + datetime.timedelta(days=13)).isoformat()},
+            {'from': 'POA', 'to': 'XXX', 'departureDate': departure, 'returnDate': departure},
+        ]
+        self.resp = {
+            'summary': {'currency': 'BRL'},
+            'options': [
+                {'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1200.0}},
+            ]
+        }
+
+    @patch('core.services.fetch_flights_from_api')
+    def test_batch_service_and_view(self, mock_fetch):
+        print("[FlightBatchSearchTests] start")
+        mock_fetch.side_effect = lambda *args: self.resp
+
+        lines = sorted(search_flights_batch(self.queries, concurrency=2), key=lambda line: line['index'])
+        self.assertEqual([line['status'] for line in lines], [200, 200, 400])
+        self.assertEqual(lines[0]['result']['summary']['total_combinations'], 1)
+
+        url = reverse('flight-search-batch')
+        body = json.dumps({'searches': self.queries})
+        r = self.client.post(url, body, content_type='application/json')
+        self.assertEqual(r.status_code, 401)
+
+        r = self.client.post(url, body, content_type='application/json', HTTP_AUTHORIZATION=f'Token {API_AUTH_TOKEN}')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Content-Type'], 'application/x-ndjson')
+        streamed = [json.loads(line) for line in b''.join(r.streaming_content).decode().splitlines()]
+        self.assertEqual(sorted(line['index'] for line in streamed), [0, 1, 2])
+
+        calls = mock_fetch.call_count
+        with patch('core.views.flights_search_views.FLIGHT_BATCH_HTTP_MAX_SIZE', 2):
+            r = self.client.post(url, body, content_type='application/json', HTTP_AUTHORIZATION=f'Token {API_AUTH_TOKEN}')
+        self.assertEqual(r.status_code, 400)
+        self.assertIn('batch_search_flights', r.json()['error'])
+        self.assertEqual(mock_fetch.call_count, calls)
+        print("[FlightBatchSearchTests] end")
+
+
+
+class FareHistoryTests(TestCase):
+    """
+    Fare observations recorded from upstream searches.
+
+    Expected:
+    - Each upstream option of both legs is stored as a FareObservation.
+    - Queued (async) observations are persisted by flush_fare_observations.
+    - The price-history endpoint returns the cheapest fare seen for the route.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Airport.objects.update_or_create(iata='POA', defaults={'city': 'POA', 'state': 'RS', 'lat': -30.03, 'lon': -51.23})
+        Airport.objects.update_or_create(iata='MAO', defaults={'city': 'MAO', 'state': 'AM', 'lat': -3.13, 'lon': -60.02})
+        today = datetime.date.today()
+        self.dates = ((today + datetime.timedelta(days=10)).isoformat(), (today + datetime.timedelta(days=15)).isoformat())
+        self.resp = {
+            'summary': {'currency': 'BRL'},
+            'options': [
+                {'flight_number': 'AM100', 'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1200.0}},
+                {'flight_number': 'AM200', 'departure_time': '2025-12-20T12:00:00', 'arrival_time': '2025-12-20T16:00:00', 'price': {'fare': 980.5}},
+            ]
+        }
+
+    @patch('core.utils.fare_history_utils.FARE_HISTORY_ASYNC', False)
+    @patch('core.services.fetch_flights_from_api')
+    def test_observations_and_cheapest(self, mock_fetch):
+        print("[FareHistoryTests] start")
+        mock_fetch.side_effect = lambda *args: self.resp
+        find_flight_combinations('POA', 'MAO', *self.dates)
+        self.assertEqual(FareObservation.objects.count(), 4)
+        self.assertEqual(FareObservation.objects.filter(origin='MAO', destination='POA').count(), 2)
+
+        r = self.client.get(reverse('fare-price-history'), {'from': 'poa', 'to': 'mao', 'days': 7}, HTTP_AUTHORIZATION=f'Token {API_AUTH_TOKEN}')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()['cheapest']['fare'], 980.5)
+        self.assertEqual(r.json()['cheapest']['flight_number'], 'AM200')
+        print("[FareHistoryTests] end")
+
+    def test_queued_observations_are_flushed(self):
+        with patch('core.utils.fare_history_utils._ensure_writer'):
+            fare_history_utils.record_fare_observations('POA', 'MAO', self.dates[0], self.resp['options'])
+        self.assertEqual(FareObservation.objects.count(), 0)
+        fare_history_utils.flush_fare_observations()
+        self.assertEqual(FareObservation.objects.count(), 2)
+
+
+
+@patch('core.utils.fare_history_utils.FARE_HISTORY_ENABLED', False)
+class CacheWarmUpTests(TestCase):
+    """
+    Ranking of popular searches and cache warm-up.
+
+    Expected:
+    - Searches logged by FlightSearchView are ranked by frequency; past departures are ignored.
+    - Warm-up fills the cache within the call budget and skips entries that are still fresh.
+    - The warm_flight_cache command refuses to run against a process-local cache.
+    - A call budget below 1 per minute is rejected (ValueError in the service, CommandError in the command).
+    """
+
+    def setUp(self):
+        cache.clear()
+        Airport.objects.update_or_create(iata='POA', defaults={'city': 'POA', 'state': 'RS', 'lat': -30.03, 'lon': -51.23})
+        Airport.objects.update_or_create(iata='MAO', defaults={'city': 'MAO', 'state': 'AM', 'lat': -3.13, 'lon': -60.02})
+        today = datetime.date.today()
+        future = [(today + datetime.timedelta(days=d)).isoformat() for d in (10, 15, 20)]
+        past = (today - datetime.timedelta(days=3)).isoformat()
+        searches = [('POA', 'MAO', future[0], future[1])] * 3 + [('MAO', 'POA', future[1], future[2])] * 2 + [('POA', 'MAO', past, future[0])]
+        for origin, destination, departure, ret in searches:
+            ApplicationLog.objects.create(level='INFO', module='core.views.flights_search_views', message='Flight search',
+                                          extra_data={'origin': origin, 'destination': destination, 'departure_date': departure, 'return_date': ret})
+        self.resp = {'summary': {'currency': 'BRL'}, 'options': []}
+
+    @patch('core.services.fetch_flights_from_api')
+    def test_rank_and_warm(self, mock_fetch):
+        print("[CacheWarmUpTests] start")
+        mock_fetch.side_effect = lambda *args: self.resp
+        ranked = rank_popular_searches()
+        self.assertEqual([(r['from'], r['hits']) for r in ranked], [('POA', 3), ('MAO', 2)])
+
+        report = warm_flight_search_cache(ranked, calls_per_minute=6000, max_calls=2, sleep=lambda s: None)
+        self.assertEqual([row['status'] for row in report], ['warmed', 'over-budget'])
+        self.assertEqual(mock_fetch.call_count, 2)
+
+        report = warm_flight_search_cache(ranked, sleep=lambda s: None)
+        self.assertEqual([row['status'] for row in report], ['fresh', 'warmed'])
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(CommandError):
+                call_command('warm_flight_cache')
+
+        with self.assertRaises(ValueError):
+            warm_flight_search_cache(ranked, calls_per_minute=0, sleep=lambda s: None)
+        for calls_per_minute in ('0', '-5'):
+            with self.assertRaises(CommandError):
+                call_command('warm_flight_cache', '--calls-per-minute', calls_per_minute)
+        print("[CacheWarmUpTests] end")
+
+
+
+class ImportLogListViewTests(TestCase):
+    """
+    Keyset pagination of the import history.
+
+    Expected:
+    - Pages are newest first, follow next_cursor without repeating rows, and omit the IATA lists.
+    - The detail view still returns the IATA lists.
+    """
+
+    def test_pagination_and_projection(self):
+        print("[ImportLogListViewTests] start")
+        for _ in range(5):
+            ImportLogModel.objects.create(status=ImportLogModel.Status.SUCCESS, created_iatas=['AAA'], updated_iatas=['BBB'])
+
+        url = reverse('import-log-list')
+        seen = []
+        cursor = None
+        while True:
+            r = self.client.get(url, {'page_size': 2, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(r.status_code, 200)
+            body = r.json()
+            self.assertNotIn('created_iatas', body['results'][0])
+            seen.extend(row['id'] for row in body['results'])
+            cursor = body['next_cursor']
+            if not cursor:
+                break
+        expected = list(ImportLogModel.objects.order_by('-start_time', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+        self.assertEqual(self.client.get(url, {'cursor': 'bogus'}).status_code, 400)
+        detail = self.client.get(reverse('import-log-detail', kwargs={'id': seen[0]})).json()
+        self.assertEqual(detail['created_iatas'], ['AAA'])
+        print("[ImportLogListViewTests] end")
+
+
+
+@patch.dict(os.environ, {'AIRPORT_DATA_URL': 'http://airports.test/feed'})
+class AirportChangeImportTests(TestCase):
+    """
+    Field-level diffs recorded by the airport import.
+
+    Expected:
+    - New airports get a CREATED change; only airports whose fields differ are updated and get an
+      UPDATED change with {field: [old, new]}; unchanged airports are not written.
+    - Changes are listed per airport and per import; a page_size below 1 is a 400.
+    """
+
+    def _import(self, feed):
+        with patch('core.services.requests.get') as mock_get:
+            mock_get.return_value.json.return_value = feed
+            mock_get.return_value.raise_for_status.return_value = None
+            return import_airports_from_api()
+
+    def test_diff_and_endpoints(self):
+        print("[AirportChangeImportTests] start")
+        feed = {
+            'POA': {'iata': 'POA', 'city': 'Porto Alegre', 'state': 'RS', 'lat': -30.03, 'lon': -51.23},
+            'MAO': {'iata': 'MAO', 'city': 'Manaus', 'state': 'AM', 'lat': -3.13, 'lon': -60.02},
+        }
+        first = self._import(feed)
+        self.assertEqual(sorted(first['created_iatas']), ['MAO', 'POA'])
+
+        feed['MAO'] = {**feed['MAO'], 'city': 'Manaus Intl', 'lat': -3.04}
+        second = self._import(feed)
+        self.assertEqual((second['created'], second['updated']), (0, 1))
+
+        change = AirportChange.objects.get(change_type=AirportChange.ChangeType.UPDATED)
+        self.assertEqual(change.iata, 'MAO')
+        self.assertEqual(change.changes, {'city': ['Manaus', 'Manaus Intl'], 'lat': [-3.13, -3.04]})
+        self.assertEqual(Airport.objects.get(iata='MAO').city, 'Manaus Intl')
+
+        r = self.client.get(reverse('airport-changes', kwargs={'iata': 'mao'}))
+        self.assertEqual([row['change_type'] for row in r.json()['results']], ['UPDATED', 'CREATED'])
+
+        r = self.client.get(reverse('import-log-changes', kwargs={'id': change.import_log_id}))
+        self.assertEqual(r.json()['count'], 1)
+
+        for page_size in ('0', '-5', 'x'):
+            r = self.client.get(reverse('airport-changes', kwargs={'iata': 'mao'}), {'page_size': page_size})
+            self.assertEqual(r.status_code, 400)
+        print("[AirportChangeImportTests] end")
+
+
+
+@patch.dict(os.environ, {'AIRPORT_DATA_URL': 'http://airports.test/feed'})
+class ShardedImportTests(TestCase):
+    """
+    Import with the feed normalized in a process pool.
+
+    Expected:
+    - Sharded normalization gives the same records as the serial one (IATA upper-cased, last duplicate wins).
+    - import_airports_from_api(workers=2) creates every airport and keeps the ImportLogModel counts consistent.
+    """
+
+    def setUp(self):
+        self.feed = {
+            f'K{i}': {'iata': code, 'city': f' City {i} ', 'state': 'SP', 'lat': str(-23.0 - i / 10), 'lon': -46.0}
+            for i, code in enumerate(['gru', 'CGH', 'VCP', 'SDU', 'GIG', 'BSB', 'CNF', 'gru'])
+        }
+
+    def test_sharded_import(self):
+        print("[ShardedImportTests] start")
+        items = list(self.feed.items())
+        serial, rejected = normalize_airport_records(items, workers=1)
+        self.assertEqual(normalize_airport_records(items, workers=2), (serial, rejected))
+        self.assertEqual(serial['GRU'], {'city': 'City 7', 'state': 'SP', 'lat': -23.7, 'lon': -46.0})
+
+        with patch('core.services.requests.get') as mock_get:
+            mock_get.return_value.json.return_value = self.feed
+            mock_get.return_value.raise_for_status.return_value = None
+            result = import_airports_from_api(workers=2)
+
+        self.assertEqual(result['status'], ImportLogModel.Status.SUCCESS)
+        self.assertEqual(result['created'], 7)
+        log_entry = ImportLogModel.objects.get()
+        self.assertEqual(log_entry.airports_created, Airport.objects.count())
+        print("[ShardedImportTests] end")
+
+
+
+@patch.dict(os.environ, {'AIRPORT_DATA_URL': 'http://airports.test/feed'})
+class AirportValidationTests(TestCase):
+    """
+    Validation stage of the airport import.
+
+    Expected:
+    - Bad rows (missing lat, state longer than 2 chars, bad IATA) are rejected with reasons before any write.
+    - The run still succeeds for the good rows, and the rejections are stored on ImportLogModel.
+    """
+
+    def test_bad_rows_are_quarantined(self):
+        print("[AirportValidationTests] start")
+        feed = {
+            'ok': {'iata': ' poa ', 'city': 'Porto Alegre', 'state': 'rs', 'lat': '-30.03', 'lon': -51.23},
+            'no_lat': {'iata': 'MAO', 'city': 'Manaus', 'state': 'AM', 'lon': -60.02},
+            'long_state': {'iata': 'GRU', 'city': 'Guarulhos', 'state': 'SPX', 'lat': -23.43, 'lon': -46.47},
+            'bad_iata': {'iata': 'GRUU', 'city': 'Guarulhos', 'state': 'SP', 'lat': 'north', 'lon': -46.47},
+        }
+        with patch('core.services.requests.get') as mock_get:
+            mock_get.return_value.json.return_value = feed
+            mock_get.return_value.raise_for_status.return_value = None
+            result = import_airports_from_api()
+
+        self.assertEqual(result['status'], ImportLogModel.Status.SUCCESS)
+        self.assertEqual((result['created'], result['rejected']), (1, 3))
+        self.assertEqual(list(Airport.objects.values_list('iata', 'state', 'lat')), [('POA', 'RS', -30.03)])
+
+        log_entry = ImportLogModel.objects.get()
+        reasons = {row['key']: row['reasons'] for row in log_entry.rejected_records}
+        self.assertEqual(reasons['no_lat'], ['lat missing, not a number or outside -90..90'])
+        self.assertEqual(reasons['long_state'], ['state longer than 2 characters'])
+        self.assertEqual(len(reasons['bad_iata']), 2)
+        print("[AirportValidationTests] end")
+
+
+
+class DatabaseProfileTests(TestCase):
+    """
+    Environment-driven database profiles. The suite itself runs on whichever profile DB_ENGINE selects
+    (DB_ENGINE=postgresql python manage.py test core for PostgreSQL).
+
+    Expected:
+    - sqlite: WAL/synchronous=NORMAL pragmas, IMMEDIATE transactions, persistent connections.
+    - postgresql: persistent connections with health checks, or psycopg pooling without them.
+    - On SQLite the live connection runs with synchronous=NORMAL.
+    """
+
+    def test_profiles(self):
+        print("[DatabaseProfileTests] start")
+        sqlite = database_config(Path('/srv'), {})
+        self.assertEqual(sqlite['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertIn('journal_mode=WAL', sqlite['OPTIONS']['init_command'])
+        self.assertIn('synchronous=NORMAL', sqlite['OPTIONS']['init_command'])
+        self.assertEqual(sqlite['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+        postgres = database_config(Path('/srv'), {'DB_ENGINE': 'postgresql', 'DB_HOST': 'db', 'DB_CONN_MAX_AGE': '120'})
+        self.assertEqual((postgres['HOST'], postgres['CONN_MAX_AGE'], postgres['CONN_HEALTH_CHECKS']), ('db', 120, True))
+
+        pooled = database_config(Path('/srv'), {'DB_ENGINE': 'postgresql', 'DB_POOL': 'True'})
+        self.assertEqual(pooled['CONN_MAX_AGE'], 0)
+        self.assertEqual(pooled['OPTIONS']['pool'], {'min_size': 2, 'max_size': 10})
+
+        with self.assertRaises(ValueError):
+            database_config(Path('/srv'), {'DB_ENGINE': 'oracle'})
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous')
+                self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+        print("[DatabaseProfileTests] end")
+
+
+@patch('core.utils.fare_history_utils.FARE_HISTORY_ENABLED', False)
+class RequestTimingTests(TestCase):
+    """
+    Request timing middleware, service phase hooks and the /metrics endpoint.
+
+    Expected:
+    - A flight search response carries a Server-Timing header with auth, airport lookup, one entry
+      per upstream call, enrichment, combination, serialization, db (with the query count) and total.
+    - /metrics renders Prometheus histograms for request durations, query counts and phases, to local
+      scrapers or ones presenting METRICS_TOKEN only.
+    """
+
+    def setUp(self):
+        cache.clear()
+        timing_utils.metrics.reset()
+        Airport.objects.update_or_create(iata='POA', defaults={'city': 'POA', 'state': 'RS', 'lat': -30.03, 'lon': -51.23})
+        Airport.objects.update_or_create(iata='MAO', defaults={'city': 'MAO', 'state': 'AM', 'lat': -3.13, 'lon': -60.02})
+        today = datetime.date.today()
+        self.params = {
+            'from': 'POA',
+            'to': 'MAO',
+            'departureDate': (today + datetime.timedelta(days=10)).isoformat(),
+            'returnDate': (today + datetime.timedelta(days=15)).isoformat(),
+        }
+
+    @patch('core.services.get_http_session')
+    def test_server_timing_and_metrics(self, mock_session):
+        print("[RequestTimingTests] start")
+        mock_session.return_value.get.return_value.json.return_value = {
+            'summary': {'currency': 'BRL'},
+            'options': [{'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1200.0}}],
+        }
+        r = self.client.get(reverse('flight-search'), self.params, HTTP_AUTHORIZATION=f'Token {API_AUTH_TOKEN}')
+        self.assertEqual(r.status_code, 200)
+
+        entries = [entry.split(';')[0] for entry in r['Server-Timing'].split(', ')]
+        self.assertEqual(entries.count('upstream'), 2)
+        for phase in ('auth', 'airport_lookup', 'enrich', 'combine', 'serialize', 'db', 'total'):
+            self.assertIn(phase, entries)
+        self.assertRegex(r['Server-Timing'], r'db;dur=[0-9.]+;desc="[1-9][0-9]* queries"')
+
+        metrics = self.client.get('/metrics')
+        self.assertEqual(metrics.status_code, 200)
+        body = metrics.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_duration_seconds_count{method="GET",status="200",view="flight-search"} 1', body)
+        self.assertIn('app_phase_duration_seconds_count{phase="upstream"} 2', body)
+        self.assertIn('http_request_db_queries_bucket{view="flight-search",le="+Inf"} 1', body)
+
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 403)
+        with patch('core.views.metrics_views.METRICS_TOKEN', 'scrape-secret'):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
+        print("[RequestTimingTests] end")
+
+
+class RateLimitTests(TestCase):
+    """
+    Token-bucket rate limiting on the token-protected endpoints.
+
+    Expected:
+    - Once a client's bucket is empty the view answers 429 with Retry-After, before it authenticates
+      or writes any ApplicationLog entry.
+    - Clients with the valid token and clients without it (per IP) get separate buckets.
+    - Allowed and limited requests are counted in /metrics.
+    - A batch search takes one token per search; batches larger than what is left get a 429.
+    - The price-history endpoint has its own bucket.
+    """
+
+    def setUp(self):
+        cache.clear()
+        timing_utils.metrics.reset()
+
+    @patch.dict('core.utils.rate_limit_utils.RATE_LIMITS', {'logs': (2, 1 / 60)})
+    def test_bucket_exhaustion(self):
+        print("[RateLimitTests] start")
+        url = reverse('logs-list')
+        for _ in range(2):
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Token bad').status_code, 401)
+
+        logs_before = ApplicationLog.objects.count()
+        limited = self.client.get(url, HTTP_AUTHORIZATION='Token other-bad')
+        self.assertEqual(limited.status_code, 429)
+        self.assertTrue(55 <= int(limited['Retry-After']) <= 60)
+        self.assertEqual(ApplicationLog.objects.count(), logs_before)
+        # Shared by every worker through the database
+        self.assertLess(RateLimitBucket.objects.get(key__startswith='logs:ip:').tokens, 1)
+
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=f'Token {API_AUTH_TOKEN}').status_code, 200)
+
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('rate_limit_requests_total{outcome="allowed",scope="logs"} 3', body)
+        self.assertIn('rate_limit_requests_total{outcome="limited",scope="logs"} 1', body)
+        print("[RateLimitTests] end")
+
+    @patch.dict('core.utils.rate_limit_utils.RATE_LIMITS', {'flight-batch': (3, 1 / 60), 'price-history': (1, 1 / 60)})
+    def test_batch_cost_and_price_history(self):
+        url = reverse('flight-search-batch')
+        headers = {'HTTP_AUTHORIZATION': f'Token {API_AUTH_TOKEN}'}
+        search = {'from': 'POA', 'to': 'XXX', 'departureDate': '2000-01-01', 'returnDate': '2000-01-02'}
+
+        r = self.client.post(url, json.dumps({'searches': [search] * 2}), content_type='application/json', **headers)
+        self.assertEqual(r.status_code, 200)
+        b''.join(r.streaming_content)
+        r = self.client.post(url, json.dumps({'searches': [search] * 2}), content_type='application/json', **headers)
+        self.assertEqual(r.status_code, 429)
+        self.assertIn('Retry-After', r)
+        r = self.client.post(url, json.dumps({'searches': [search] * 4}), content_type='application/json', **headers)
+        self.assertEqual(r.status_code, 429)
+        self.assertNotIn('Retry-After', r)
+
+        price_history = reverse('fare-price-history')
+        self.assertEqual(self.client.get(price_history, {'from': 'POA', 'to': 'MAO'}, **headers).status_code, 200)
+        self.assertEqual(self.client.get(price_history, {'from': 'POA', 'to': 'MAO'}, **headers).status_code, 429)
+
+
+class StartupTests(TestCase):
+    """
+    Start-up work: lazy imports, the airport index and the migrate-only-when-needed check.
+
+    Expected:
+    - Booting the WSGI app and URLconf in a fresh interpreter doesn't import requests.
+    - The airport index picks up saved airports and imports (version bump), and find_flight_combinations
+      resolves indexed airports without querying the airport table.
+    - With every migration applied, pending_migrations() is empty so migrate_if_needed() doesn't run migrate.
+    """
+
+    def test_boot_does_not_import_requests(self):
+        print("[StartupTests] start")
+        boot = (
+            "import os, sys; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'import_airports.settings'); "
+            "import import_airports.wsgi; from django.urls import get_resolver; get_resolver().url_patterns; "
+            "print('requests' in sys.modules)"
+        )
+        completed = subprocess.run(
+            [sys.executable, '-c', boot],
+            cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(completed.stdout.strip(), 'False')
+
+    def test_airport_index_and_migrations(self):
+        Airport.objects.create(iata='POA', city='Porto Alegre', state='RS', lat=-30.03, lon=-51.23)
+        Airport.objects.create(iata='MAO', city='Manaus', state='AM', lat=-3.13, lon=-60.02)
+        index = get_airport_index()
+        self.assertEqual(index.airports['POA'].city, 'Porto Alegre')
+        self.assertIs(get_airport_index(), index)
+
+        apply_airport_records(ImportLogModel.objects.create(), {'GRU': {'city': 'Guarulhos', 'state': 'SP', 'lat': -23.43, 'lon': -46.47}}, keep={'POA', 'MAO'})
+        self.assertIn('GRU', get_airport_index().airports)
+
+        today = datetime.date.today()
+        with patch('core.services.build_flight_combinations', return_value={'summary': {}}), \
+                patch('core.services.Airport.objects.get') as mock_get:
+            find_flight_combinations('poa', 'MAO', (today + datetime.timedelta(days=3)).isoformat(), (today + datetime.timedelta(days=5)).isoformat())
+        mock_get.assert_not_called()
+
+        with patch('core.utils.startup_utils.call_command') as mock_migrate:
+            self.assertEqual(pending_migrations(), [])
+            self.assertFalse(migrate_if_needed())
+        mock_migrate.assert_not_called()
+        print("[StartupTests] end")
+
+
+@patch.dict(os.environ, {'AIRPORT_DATA_URL': 'http://airports.test/feed'})
+class AirportSyncTests(TestCase):
+    """
+    Airports leaving the feed and the delta sync endpoint.
+
+    Expected:
+    - An import deletes airports missing from the feed (with a DELETED change and a tombstone), but not
+      airports whose row was only rejected by validation, and never on an empty feed.
+    - /api/airports/sync/ returns everything without a cursor, then only what was created, updated or
+      deleted after `since` / `since_import`; an airport that comes back loses its tombstone.
+    - Import deletions write their tombstones in bulk (the per-row post_delete handler stays out);
+      deleting a single airport elsewhere still leaves a tombstone.
+    """
+
+    def _import(self, feed):
+        with patch('core.services.requests.get') as mock_get:
+            mock_get.return_value.json.return_value = feed
+            mock_get.return_value.raise_for_status.return_value = None
+            return import_airports_from_api()
+
+    def test_deletions_and_sync(self):
+        print("[AirportSyncTests] start")
+        feed = {
+            code: {'iata': code, 'city': f'City {code}', 'state': 'SP', 'lat': -23.0, 'lon': -46.0}
+            for code in ('GRU', 'CGH', 'VCP', 'SDU')
+        }
+        first = self._import(feed)
+        url = reverse('airport-sync')
+        snapshot = self.client.get(url).json()
+        self.assertEqual(sorted(row['iata'] for row in snapshot['created']), ['CGH', 'GRU', 'SDU', 'VCP'])
+
+        del feed['VCP']
+        feed['SDU'] = {**feed['SDU'], 'lat': 'not a number'}
+        feed['CGH'] = {**feed['CGH'], 'city': 'Congonhas'}
+        with patch('core.signals.invalidate_airport_index') as per_row_invalidation:
+            second = self._import(feed)
+        per_row_invalidation.assert_not_called()
+        self.assertEqual((second['deleted_iatas'], second['updated_iatas'], second['rejected']), (['VCP'], ['CGH'], 1))
+        self.assertTrue(Airport.objects.filter(iata='SDU').exists())
+        self.assertTrue(AirportTombstone.objects.filter(iata='VCP').exists())
+        self.assertEqual(AirportChange.objects.get(change_type=AirportChange.ChangeType.DELETED).changes['city'], ['City VCP', None])
+
+        delta = self.client.get(url, {'since': snapshot['next_cursor']}).json()
+        self.assertEqual(([row['iata'] for row in delta['updated']], delta['created'], delta['deleted']), (['CGH'], [], ['VCP']))
+        by_import = self.client.get(url, {'since_import': ImportLogModel.objects.get(airports_created=4).id}).json()
+        self.assertEqual(by_import['deleted'], ['VCP'])
+
+        self.assertEqual(self._import({})['deleted'], 0)
+        feed['VCP'] = {'iata': 'VCP', 'city': 'Campinas', 'state': 'SP', 'lat': -23.0, 'lon': -47.1}
+        self.assertEqual(self._import(feed)['created_iatas'], ['VCP'])
+        self.assertFalse(AirportTombstone.objects.filter(iata='VCP').exists())
+
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(first['deleted'], 0)
+
+        Airport.objects.get(iata='GRU').delete()
+        self.assertTrue(AirportTombstone.objects.filter(iata='GRU').exists())
+        print("[AirportSyncTests] end")
+
+
+class AirportAutocompleteTests(TestCase):
+    """
+    Type-ahead over the in-memory airport index.
+
+    Expected:
+    - Prefixes match IATA codes, city names and words inside city names, ignoring case and accents.
+    - The exact IATA code comes first, then airports ranked by logged search popularity.
+    - Imports rebuild the index, so new airports are suggested right away.
+    - The lookup snapshot used by flight searches is rebuilt with a single query, without the
+      popularity aggregate.
+    """
+
+    def setUp(self):
+        cache.clear()
+        for _ in range(3):
+            ApplicationLog.objects.create(level='INFO', module='core.views.flights_search_views', message='Flight search',
+                                          extra_data={'origin': 'CGH', 'destination': 'SSA'})
+        Airport.objects.create(iata='GRU', city='São Paulo', state='SP', lat=-23.43, lon=-46.47)
+        Airport.objects.create(iata='CGH', city='São Paulo', state='SP', lat=-23.62, lon=-46.65)
+        Airport.objects.create(iata='SSA', city='Salvador', state='BA', lat=-12.91, lon=-38.33)
+        Airport.objects.create(iata='SJP', city='São José do Rio Preto', state='SP', lat=-20.81, lon=-49.4)
+
+    def _codes(self, query, **params):
+        r = self.client.get(reverse('airport-autocomplete'), {'q': query, **params})
+        self.assertEqual(r.status_code, 200)
+        return [airport['iata'] for airport in r.json()['results']]
+
+    def test_autocomplete(self):
+        print("[AirportAutocompleteTests] start")
+        self.assertEqual(self._codes('sao'), ['CGH', 'GRU', 'SJP'])
+        self.assertEqual(self._codes('SÃO P'), ['CGH', 'GRU'])
+        self.assertEqual(self._codes('paulo'), ['CGH', 'GRU'])
+        self.assertEqual(self._codes('s', limit=2), ['CGH', 'SSA'])
+        self.assertEqual(self._codes('gru'), ['GRU'])
+        self.assertEqual(self._codes('ssa'), ['SSA'])
+        self.assertEqual(self._codes(''), [])
+        self.assertEqual(self.client.get(reverse('airport-autocomplete'), {'q': 's', 'limit': 500}).status_code, 400)
+
+        apply_airport_records(ImportLogModel.objects.create(), {'SDU': {'city': 'Rio de Janeiro', 'state': 'RJ', 'lat': -22.91, 'lon': -43.16}},
+                              keep={'GRU', 'CGH', 'SSA', 'SJP'})
+        self.assertEqual(self._codes('rio'), ['SDU', 'SJP'])
+
+        invalidate_airport_index()
+        with self.assertNumQueries(1):
+            get_airport_index()
+        print("[AirportAutocompleteTests] end")
+
+
+class FeeRuleTests(TestCase):
+    """
+    Fee schedule compiled from FeeRule rows.
+
+    Expected:
+    - Without rules every route gets the default 10% / R$40 fee.
+    - The most specific rule wins: route + airline, then route, then origin, then airline alone.
+    - Saving or deleting a rule takes effect on the next lookup after its transaction commits, and
+      changes the flight search cache key; pricing itself runs no queries.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fee_rules(self):
+        print("[FeeRuleTests] start")
+        self.assertEqual(route_fees('POA', 'MAO').default, DEFAULT_FEE)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FeeRule.objects.create(airline='am', rate=0.2, minimum_fee=10)
+            FeeRule.objects.create(origin='POA', rate=0.05, minimum_fee=30)
+            route = FeeRule.objects.create(origin='POA', destination='MAO', rate=0.08, minimum_fee=20)
+            FeeRule.objects.create(origin='POA', destination='MAO', airline='AM', rate=0.12, minimum_fee=50)
+            FeeRule.objects.create(origin='GRU', rate=0.01, minimum_fee=1, active=False)
+
+        poa_mao = route_fees('poa', 'mao')
+        self.assertEqual(poa_mao.default, Fee(0.08, 20))
+        self.assertEqual(poa_mao.for_option({'flight_number': 'AM100'}), Fee(0.12, 50))
+        self.assertEqual(route_fees('POA', 'GRU').default, Fee(0.05, 30))
+        self.assertEqual(route_fees('POA', 'GRU').for_option({'flight_number': 'AM1'}), Fee(0.05, 30))
+        self.assertEqual(route_fees('GRU', 'POA').for_option({'flight_number': 'AM1'}), Fee(0.2, 10))
+        self.assertEqual(route_fees('GRU', 'POA').for_option({'flight_number': 'LA1'}), DEFAULT_FEE)
+
+        options = [
+            {'flight_number': 'AM100', 'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1000.0}},
+            {'flight_number': 'G3200', 'departure_time': '2025-12-20T10:00:00', 'arrival_time': '2025-12-20T14:00:00', 'price': {'fare': 1000.0}},
+        ]
+        with self.assertNumQueries(0):
+            enriched = enrich_flight_options(options, 3000.0, route_fees('POA', 'MAO'))
+        self.assertEqual([(option.fee, option.total) for option in enriched], [(120.0, 1120.0), (80.0, 1080.0)])
+        self.assertEqual(calculate_price(1000.0, Fee(0.12, 50)), {'fare': 1000.0, 'fee': 120.0, 'total': 1120.0})
+
+        key = search_cache_utils.search_cache_key('POA', 'MAO', '2025-12-20', '2025-12-25')
+        route.rate = 0.09
+        with self.captureOnCommitCallbacks() as callbacks:
+            route.save()
+        # The schedule is only invalidated once the transaction commits
+        self.assertEqual(route_fees('POA', 'MAO').default, Fee(0.08, 20))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(route_fees('POA', 'MAO').default, Fee(0.09, 20))
+        # Cached searches priced with the old fees are no longer read
+        self.assertNotEqual(search_cache_utils.search_cache_key('POA', 'MAO', '2025-12-20', '2025-12-25'), key)
+        with self.captureOnCommitCallbacks(execute=True):
+            route.delete()
+        self.assertEqual(route_fees('POA', 'MAO').default, Fee(0.05, 30))
+        print("[FeeRuleTests] end")
+
+
+class ConditionalGetTests(TestCase):
+    """
+    ETag / Last-Modified validators on read endpoints.
+
+    Expected:
+    - Airport detail, finished import logs and logs answer a matching If-None-Match with a 304 and no body.
+    - Validators change when the airport is modified or a new log is written.
+    - Unauthorized log requests get a 401 without validators; running imports aren't validated.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.auth = {'HTTP_AUTHORIZATION': f'Token {API_AUTH_TOKEN}'}
+
+    def _revalidate(self, url, **headers):
+        first = self.client.get(url, **headers)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header('Last-Modified'))
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'], **headers)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again['Cache-Control'], first['Cache-Control'])
+        return first
+
+    def test_conditional_get(self):
+        print("[ConditionalGetTests] start")
+        airport = Airport.objects.create(iata='POA', city='Porto Alegre', state='RS', lat=-30.03, lon=-51.23)
+        url = reverse('airport-detail', kwargs={'iata': 'poa'})
+        first = self._revalidate(url)
+        self.assertIn('public', first['Cache-Control'])
+        airport.city = 'Porto Alegre (Salgado Filho)'
+        airport.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+        self.assertEqual(self.client.get(reverse('airport-detail', kwargs={'iata': 'XXX'})).status_code, 404)
+
+        running = ImportLogModel.objects.create(status=ImportLogModel.Status.SUCCESS)
+        r = self.client.get(reverse('import-log-detail', kwargs={'id': running.id}))
+        self.assertFalse(r.has_header('ETag'))
+        self.assertIn('no-cache', r['Cache-Control'])
+        running.end_time = datetime.datetime.now(datetime.timezone.utc)
+        running.save()
+        self._revalidate(reverse('import-log-detail', kwargs={'id': running.id}))
+
+        ApplicationLog.objects.create(level='INFO', module='tests', message='first')
+        logs_url = reverse('logs-list')
+        self.assertFalse(self.client.get(logs_url, HTTP_IF_NONE_MATCH='*').has_header('ETag'))
+        self.assertEqual(self.client.get(logs_url, HTTP_IF_NONE_MATCH='*').status_code, 401)
+        first = self._revalidate(logs_url, **self.auth)
+        self.assertIn('private', first['Cache-Control'])
+        ApplicationLog.objects.create(level='INFO', module='tests', message='second')
+        self.assertEqual(self.client.get(logs_url, HTTP_IF_NONE_MATCH=first['ETag'], **self.auth).status_code, 200)
+        print("[ConditionalGetTests] end")
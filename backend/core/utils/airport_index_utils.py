@@ -0,0 +1,190 @@
+"""
+Process-local, read-only snapshots of the airport table for hot-path lookups and autocomplete.
+
+The lookup snapshot is a VersionedSnapshot (see snapshot_utils): imports and airport saves/deletes
+invalidate it, and AIRPORT_INDEX_MAX_AGE_SECONDS bounds staleness. It is a plain IATA -> airport
+dict, cheap to rebuild on the search path.
+
+Autocomplete keeps its own structures (prefix keys and the search popularity ranking), built on the
+first autocomplete request after the lookup snapshot changes or AUTOCOMPLETE_RANKING_MAX_AGE_SECONDS
+pass. The popularity aggregate over ApplicationLog is shared through the cache, so it runs at most
+once per AUTOCOMPLETE_POPULARITY_CACHE_SECONDS across processes, and never for a flight search.
+"""
+import bisect
+import datetime
+import heapq
+import os
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .snapshot_utils import VersionedSnapshot
+
+
+AIRPORT_INDEX_VERSION_KEY = 'airport-index-version'
+AIRPORT_INDEX_MAX_AGE_SECONDS = int(os.getenv('AIRPORT_INDEX_MAX_AGE_SECONDS', '300'))
+# Flight searches from this many past days rank autocomplete suggestions
+AUTOCOMPLETE_POPULARITY_DAYS = int(os.getenv('AUTOCOMPLETE_POPULARITY_DAYS', '30'))
+AUTOCOMPLETE_POPULARITY_KEY = 'autocomplete-popularity'
+AUTOCOMPLETE_POPULARITY_CACHE_SECONDS = int(os.getenv('AUTOCOMPLETE_POPULARITY_CACHE_SECONDS', '3600'))
+AUTOCOMPLETE_RANKING_MAX_AGE_SECONDS = int(os.getenv('AUTOCOMPLETE_RANKING_MAX_AGE_SECONDS', '600'))
+AUTOCOMPLETE_MAX_RESULTS = 20
+
+
+class IndexedAirport(NamedTuple):
+    iata: str
+    city: str
+    state: str
+    lat: float
+    lon: float
+
+
+class AirportIndex(NamedTuple):
+    airports: Dict[str, IndexedAirport]
+
+
+class AutocompleteIndex(NamedTuple):
+    # The lookup snapshot this was built from; a new one means airports changed
+    source: AirportIndex
+    built_at: float
+    # `prefix_keys` is sorted, `prefix_entries[i]` is the position in `entries` of the airport
+    # `prefix_keys[i]` belongs to. Keys are the folded IATA code, city and each city word.
+    # `by_rank` lists entry positions most searched first; `entry_keys[position]` are its keys.
+    entries: List[IndexedAirport]
+    prefix_keys: List[str]
+    prefix_entries: List[int]
+    rank: List[int]
+    by_rank: List[int]
+    entry_keys: List[Tuple[str, ...]]
+
+
+_autocomplete: Optional[AutocompleteIndex] = None
+_autocomplete_lock = threading.Lock()
+
+
+def fold(text: str) -> str:
+    """Lower-cases and strips accents ("São Paulo" -> "sao paulo") for accent-insensitive matching."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold().strip()
+
+
+def search_popularity(days: int = AUTOCOMPLETE_POPULARITY_DAYS) -> Counter:
+    """
+    Times each airport was an origin or destination of a logged flight search in the last `days`
+    days. A GROUP BY over the log table: use cached_search_popularity() on request paths.
+    """
+    from core.models.log_model import ApplicationLog
+    from core.services import FLIGHT_SEARCH_LOG_MESSAGE
+
+    searches = ApplicationLog.objects.filter(
+        module='core.views.flights_search_views',
+        message=FLIGHT_SEARCH_LOG_MESSAGE,
+        timestamp__gte=timezone.now() - datetime.timedelta(days=days),
+    )
+    popularity: Counter = Counter()
+    for key in ('extra_data__origin', 'extra_data__destination'):
+        for row in searches.values(key).annotate(hits=Count('id')).order_by():
+            if isinstance(row[key], str):
+                popularity[row[key].upper()] += row['hits']
+    return popularity
+
+
+def cached_search_popularity() -> Counter:
+    """search_popularity(), computed by one process and shared through the cache for a while."""
+    return cache.get_or_set(AUTOCOMPLETE_POPULARITY_KEY, search_popularity, AUTOCOMPLETE_POPULARITY_CACHE_SECONDS)
+
+
+def build_airport_index() -> AirportIndex:
+    from core.models.airport_model import Airport
+
+    rows = Airport.objects.values_list('iata', 'city', 'state', 'lat', 'lon').iterator(chunk_size=5000)
+    return AirportIndex(
+        airports={iata.upper(): IndexedAirport(iata.upper(), *fields) for iata, *fields in rows},
+    )
+
+
+def build_autocomplete_index(source: AirportIndex) -> AutocompleteIndex:
+    entries = sorted(source.airports.values())
+    popularity_by_iata = cached_search_popularity()
+
+    entry_keys = []
+    keys = []
+    for position, airport in enumerate(entries):
+        city = fold(airport.city)
+        words = tuple(word for word in {city, airport.iata.casefold(), *city.split()} if word)
+        entry_keys.append(words)
+        keys.extend((word, position) for word in words)
+    keys.sort()
+
+    by_rank = sorted(range(len(entries)), key=lambda position: -popularity_by_iata.get(entries[position].iata, 0))
+    rank = [0] * len(entries)
+    for place, position in enumerate(by_rank):
+        rank[position] = place
+
+    return AutocompleteIndex(
+        source=source,
+        built_at=time.monotonic(),
+        entries=entries,
+        prefix_keys=[key for key, _ in keys],
+        prefix_entries=[position for _, position in keys],
+        rank=rank,
+        by_rank=by_rank,
+        entry_keys=entry_keys,
+    )
+
+
+_airport_index = VersionedSnapshot(AIRPORT_INDEX_VERSION_KEY, build_airport_index, AIRPORT_INDEX_MAX_AGE_SECONDS)
+get_airport_index = _airport_index.get
+invalidate_airport_index = _airport_index.invalidate
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """Autocomplete structures for the current lookup snapshot, rebuilt when it or the ranking is outdated."""
+    global _autocomplete
+    source = get_airport_index()
+    autocomplete = _autocomplete
+    if autocomplete is not None and autocomplete.source is source and time.monotonic() - autocomplete.built_at < AUTOCOMPLETE_RANKING_MAX_AGE_SECONDS:
+        return autocomplete
+
+    with _autocomplete_lock:
+        if _autocomplete is not None and _autocomplete is not autocomplete and _autocomplete.source is source:
+            return _autocomplete
+        _autocomplete = build_autocomplete_index(source)
+        return _autocomplete
+
+
+def autocomplete_airports(query: str, limit: int = 10) -> List[IndexedAirport]:
+    """
+    Airports whose IATA code, city or a word of the city starts with `query` (accent- and
+    case-insensitive). An exact IATA match comes first, then the most searched airports.
+    """
+    prefix = fold(query)
+    if not prefix:
+        return []
+    index = get_autocomplete_index()
+    start = bisect.bisect_left(index.prefix_keys, prefix)
+    end = bisect.bisect_left(index.prefix_keys, prefix + '\U0010ffff', start)
+
+    if (end - start) * (end - start) <= limit * len(index.entries):
+        # Narrow prefix: rank the matches
+        best = heapq.nsmallest(limit, set(index.prefix_entries[start:end]), key=index.rank.__getitem__)
+    else:
+        # Broad prefix ("s", "sa"): walk airports by popularity until enough of them match
+        best = []
+        for position in index.by_rank:
+            if any(key.startswith(prefix) for key in index.entry_keys[position]):
+                best.append(position)
+                if len(best) == limit:
+                    break
+
+    exact = index.source.airports.get(prefix.upper())
+    results = [index.entries[position] for position in best]
+    if exact is not None:
+        results = [exact, *(airport for airport in results if airport is not exact)][:limit]
+    return results
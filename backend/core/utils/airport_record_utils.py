@@ -0,0 +1,123 @@
+"""
+Validation and normalization of raw airport feed records, optionally sharded across a process pool.
+
+Everything here is plain Python (no ORM access) so it can run in worker processes; the
+database writes stay in core.services.apply_airport_records, a single batched writer.
+"""
+import math
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+IATA_LENGTH = 3
+STATE_MAX_LENGTH = 2
+CITY_MAX_LENGTH = 100
+
+FeedItem = Tuple[str, Mapping[str, Any]]
+
+
+def _coordinate(value: Any, limit: float) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) and -limit <= number <= limit else None
+
+
+def validate_airport_record(raw: Any) -> Tuple[Optional[Dict[str, Any]], Optional[List[str]]]:
+    """
+    Coerces a feed record into Airport fields. Returns (fields, None) for a valid record and
+    (None, reasons) for a rejected one; the reasons list is only built for bad rows.
+    """
+    if not isinstance(raw, Mapping):
+        return None, ['record is not an object']
+
+    iata = raw.get('iata')
+    iata = iata.strip().upper() if isinstance(iata, str) else ''
+    state = raw.get('state')
+    state = state.strip().upper() if isinstance(state, str) else None
+    city = raw.get('city')
+    city = city.strip() if isinstance(city, str) else None
+    lat = _coordinate(raw.get('lat'), 90.0)
+    lon = _coordinate(raw.get('lon'), 180.0)
+
+    if (len(iata) == IATA_LENGTH and iata.isalnum() and iata.isascii()
+            and state and len(state) <= STATE_MAX_LENGTH
+            and city and len(city) <= CITY_MAX_LENGTH
+            and lat is not None and lon is not None):
+        return {'iata': iata, 'state': state, 'city': city, 'lat': lat, 'lon': lon}, None
+
+    reasons = []
+    if not iata:
+        reasons.append('missing iata')
+    elif len(iata) != IATA_LENGTH or not (iata.isalnum() and iata.isascii()):
+        reasons.append(f'iata must be {IATA_LENGTH} letters or digits')
+    if not state:
+        reasons.append('missing state')
+    elif len(state) > STATE_MAX_LENGTH:
+        reasons.append(f'state longer than {STATE_MAX_LENGTH} characters')
+    if not city:
+        reasons.append('missing city')
+    elif len(city) > CITY_MAX_LENGTH:
+        reasons.append(f'city longer than {CITY_MAX_LENGTH} characters')
+    if lat is None:
+        reasons.append('lat missing, not a number or outside -90..90')
+    if lon is None:
+        reasons.append('lon missing, not a number or outside -180..180')
+    return None, reasons
+
+
+def normalize_shard(items: Iterable[FeedItem]) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validates a batch of (feed key, record) pairs. Returns the valid records as an IATA -> fields
+    mapping (last record wins on duplicates) and the rejected ones with their reasons.
+    """
+    normalized = {}
+    rejected = []
+    for key, raw in items:
+        record, reasons = validate_airport_record(raw)
+        if record is None:
+            rejected.append({'key': key, 'record': raw, 'reasons': reasons})
+        else:
+            normalized[record.pop('iata')] = record
+    return normalized, rejected
+
+
+def _iata_prefix(raw: Any) -> str:
+    iata = raw.get('iata') if isinstance(raw, Mapping) else None
+    return iata.strip().upper()[:1] if isinstance(iata, str) else ''
+
+
+def shard_by_iata_prefix(items: Iterable[FeedItem], shards: int) -> List[List[FeedItem]]:
+    """
+    Partitions feed items by the first letter of their IATA code, so every duplicate of a code lands
+    in the same shard and "last record wins" holds across shards.
+    """
+    partitions: List[List[FeedItem]] = [[] for _ in range(shards)]
+    for item in items:
+        partitions[zlib.crc32(_iata_prefix(item[1]).encode()) % shards].append(item)
+    return [partition for partition in partitions if partition]
+
+
+def normalize_airport_records(
+    items: List[FeedItem],
+    workers: int = 1
+) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validates and normalizes a whole feed, given as (feed key, record) pairs. With `workers` > 1
+    the items are sharded by IATA prefix and each shard runs in its own process; the shards don't
+    overlap, so merging is a dict update.
+    """
+    if workers <= 1 or len(items) < workers:
+        return normalize_shard(items)
+
+    normalized: Dict[str, Dict[str, Any]] = {}
+    rejected: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_records, shard_rejected in executor.map(normalize_shard, shard_by_iata_prefix(items, workers * 4)):
+            normalized.update(shard_records)
+            rejected.extend(shard_rejected)
+    return normalized, rejected
@@ -0,0 +1,161 @@
+"""Asynchronous, batched persistence of fares seen in upstream flight searches."""
+import atexit
+import datetime
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from django.db import close_old_connections
+from django.db.models import Min
+from django.utils import timezone
+
+from .logging_utils import log_error
+
+
+FARE_HISTORY_ENABLED = os.getenv('FARE_HISTORY_ENABLED', 'True') == 'True'
+# When False observations are written in the caller's thread (useful for tests and scripts)
+FARE_HISTORY_ASYNC = os.getenv('FARE_HISTORY_ASYNC', 'True') == 'True'
+FARE_HISTORY_BATCH_SIZE = int(os.getenv('FARE_HISTORY_BATCH_SIZE', '500'))
+FARE_HISTORY_FLUSH_SECONDS = float(os.getenv('FARE_HISTORY_FLUSH_SECONDS', '2'))
+# Observations beyond this many pending rows are dropped rather than growing memory while the DB is slow
+FARE_HISTORY_QUEUE_SIZE = int(os.getenv('FARE_HISTORY_QUEUE_SIZE', '50000'))
+
+_pending: 'queue.Queue' = queue.Queue(maxsize=FARE_HISTORY_QUEUE_SIZE)
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_write_lock = threading.Lock()
+dropped_observations = 0
+
+
+def _write(observations: List[Any], writer_thread: bool = False) -> None:
+    from core.models.fare_observation_model import FareObservation
+
+    if not observations:
+        return
+    try:
+        with _write_lock:
+            FareObservation.objects.bulk_create(observations, batch_size=FARE_HISTORY_BATCH_SIZE)
+    except Exception as e:
+        if writer_thread:
+            # The failure may be the connection itself; log over a fresh one
+            close_old_connections()
+        log_error('core.utils.fare_history_utils', f"Failed to persist {len(observations)} fare observations: {str(e)}", {'error': str(e)})
+
+
+def _drain(limit: int, timeout: Optional[float]) -> List[Any]:
+    """Takes up to `limit` pending observations, waiting at most `timeout` seconds in total."""
+    batch = []
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    while len(batch) < limit:
+        try:
+            if deadline is None:
+                batch.append(_pending.get_nowait())
+            else:
+                batch.append(_pending.get(timeout=max(deadline - time.monotonic(), 0)))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _writer_loop() -> None:
+    while True:
+        batch = [_pending.get()]
+        batch.extend(_drain(FARE_HISTORY_BATCH_SIZE - 1, FARE_HISTORY_FLUSH_SECONDS))
+        # This thread lives outside the request cycle, so CONN_MAX_AGE and CONN_HEALTH_CHECKS never
+        # run for it: drop broken or expired connections around each batch, as Django does per request
+        close_old_connections()
+        try:
+            _write(batch, writer_thread=True)
+        finally:
+            close_old_connections()
+
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is None or not _writer_thread.is_alive():
+        with _writer_lock:
+            if _writer_thread is None or not _writer_thread.is_alive():
+                _writer_thread = threading.Thread(target=_writer_loop, name='fare-history-writer', daemon=True)
+                _writer_thread.start()
+
+
+def record_fare_observations(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    options: Sequence[Mapping[str, Any]],
+) -> None:
+    """Queues one observation per upstream option. Never raises into the search path."""
+    from core.models.fare_observation_model import FareObservation
+
+    global dropped_observations
+    if not FARE_HISTORY_ENABLED or not options:
+        return
+
+    fetched_at = timezone.now()
+    travel_date = datetime.date.fromisoformat(departure_date)
+    observations = [
+        FareObservation(
+            origin=origin.upper(),
+            destination=destination.upper(),
+            departure_date=travel_date,
+            flight_number=str(option.get('flight_number') or '')[:16],
+            fare=option.get('price', {}).get('fare', 0.0),
+            fetched_at=fetched_at,
+        )
+        for option in options
+    ]
+
+    if not FARE_HISTORY_ASYNC:
+        _write(observations)
+        return
+
+    for observation in observations:
+        try:
+            _pending.put_nowait(observation)
+        except queue.Full:
+            dropped_observations += 1
+    _ensure_writer()
+
+
+def flush_fare_observations() -> None:
+    """Writes every pending observation in the calling thread."""
+    while True:
+        batch = _drain(FARE_HISTORY_BATCH_SIZE, None)
+        if not batch:
+            return
+        _write(batch)
+
+
+atexit.register(flush_fare_observations)
+
+
+def cheapest_fares_for_route(origin: str, destination: str, days: int = 30) -> Dict[str, Any]:
+    """Cheapest fare seen for a route over the last `days` days, overall and per travel date."""
+    from core.models.fare_observation_model import FareObservation
+
+    observations = FareObservation.objects.filter(
+        origin=origin.upper(),
+        destination=destination.upper(),
+        fetched_at__gte=timezone.now() - datetime.timedelta(days=days),
+    )
+    cheapest = observations.order_by('fare', '-fetched_at').first()
+    per_date = observations.values('departure_date').annotate(cheapest_fare=Min('fare')).order_by('departure_date')
+
+    return {
+        'from': origin.upper(),
+        'to': destination.upper(),
+        'days': days,
+        'cheapest': {
+            'fare': cheapest.fare,
+            'departure_date': cheapest.departure_date.isoformat(),
+            'flight_number': cheapest.flight_number,
+            'fetched_at': cheapest.fetched_at.isoformat(),
+        } if cheapest else None,
+        'by_departure_date': [
+            {'departure_date': row['departure_date'].isoformat(), 'cheapest_fare': row['cheapest_fare']}
+            for row in per_date
+        ],
+    }
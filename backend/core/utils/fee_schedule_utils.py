@@ -0,0 +1,116 @@
+"""
+Process-local fee schedule compiled from FeeRule rows, so pricing an option never touches the database.
+
+Rules are loaded into a dict keyed on (origin, destination, airline), '' meaning any, held in a
+VersionedSnapshot (see snapshot_utils): FeeRule saves and deletes invalidate it (core/signals.py)
+and FEE_SCHEDULE_MAX_AGE_SECONDS bounds staleness. Each route is resolved once per schedule into a
+RouteFees (the route's fee plus its airline overrides), after which an option's fee is a single
+dict lookup.
+
+Precedence: the rule matching the most fields wins; on a tie origin beats destination beats airline.
+"""
+import os
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Tuple
+
+from .snapshot_utils import VersionedSnapshot
+
+
+FEE_SCHEDULE_VERSION_KEY = 'fee-schedule-version'
+FEE_SCHEDULE_MAX_AGE_SECONDS = int(os.getenv('FEE_SCHEDULE_MAX_AGE_SECONDS', '300'))
+# Applied when no FeeRule matches
+FEE_RATE = float(os.getenv('DEFAULT_FEE_RATE', '0.10'))
+MINIMUM_FEE = float(os.getenv('DEFAULT_MINIMUM_FEE', '40.0'))
+
+RuleKey = Tuple[str, str, str]
+
+# Which of (origin, destination, airline) a rule pins, most specific first
+MATCH_ORDER = ((1, 1, 1), (1, 1, 0), (1, 0, 1), (0, 1, 1), (1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, 0))
+
+
+class Fee(NamedTuple):
+    rate: float
+    minimum: float
+
+
+DEFAULT_FEE = Fee(FEE_RATE, MINIMUM_FEE)
+
+
+class RouteFees(NamedTuple):
+    """Fees of one directed route: `default` for any airline, `airlines` for those with their own rule."""
+    default: Fee
+    airlines: Mapping[str, Fee]
+
+    def for_option(self, option: Mapping[str, object]) -> Fee:
+        return self.airlines.get(airline_code(option), self.default)
+
+
+DEFAULT_ROUTE_FEES = RouteFees(DEFAULT_FEE, {})
+
+
+class FeeSchedule(NamedTuple):
+    rules: Dict[RuleKey, Fee]
+    airlines: FrozenSet[str]
+    # origin, destination -> RouteFees, filled on first use of each route
+    routes: Dict[Tuple[str, str], RouteFees]
+
+
+def airline_code(option: Mapping[str, object]) -> str:
+    """Airline designator of an upstream option: the first two characters of its flight number."""
+    return str(option.get('flight_number') or '')[:2].upper()
+
+
+def build_fee_schedule() -> FeeSchedule:
+    from core.models.fee_rule_model import FeeRule
+
+    rules = {
+        (origin, destination, airline): Fee(rate, minimum_fee)
+        for origin, destination, airline, rate, minimum_fee in FeeRule.objects.filter(active=True).values_list(
+            'origin', 'destination', 'airline', 'rate', 'minimum_fee'
+        )
+    }
+    return FeeSchedule(
+        rules=rules,
+        airlines=frozenset(airline for _, _, airline in rules if airline),
+        routes={},
+    )
+
+
+_fee_schedule = VersionedSnapshot(FEE_SCHEDULE_VERSION_KEY, build_fee_schedule, FEE_SCHEDULE_MAX_AGE_SECONDS)
+get_fee_schedule = _fee_schedule.get
+invalidate_fee_schedule = _fee_schedule.invalidate
+# Part of the flight search cache key, so a rule change retires results priced with the old fees
+fee_schedule_version = _fee_schedule.version
+
+
+def _match(rules: Mapping[RuleKey, Fee], origin: str, destination: str, airline: str) -> Fee:
+    for pins_origin, pins_destination, pins_airline in MATCH_ORDER:
+        if pins_airline and not airline:
+            continue
+        fee = rules.get((
+            origin if pins_origin else '',
+            destination if pins_destination else '',
+            airline if pins_airline else '',
+        ))
+        if fee is not None:
+            return fee
+    return DEFAULT_FEE
+
+
+def route_fees(origin: str, destination: str) -> RouteFees:
+    """Fees for flights from `origin` to `destination`, resolved once per route and schedule."""
+    schedule = get_fee_schedule()
+    route = (origin.upper(), destination.upper())
+    fees = schedule.routes.get(route)
+    if fees is None:
+        if not schedule.rules:
+            fees = DEFAULT_ROUTE_FEES
+        else:
+            default = _match(schedule.rules, *route, '')
+            airlines = {}
+            for airline in schedule.airlines:
+                fee = _match(schedule.rules, *route, airline)
+                if fee != default:
+                    airlines[airline] = fee
+            fees = RouteFees(default, airlines)
+        schedule.routes[route] = fees
+    return fees
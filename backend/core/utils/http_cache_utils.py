@@ -0,0 +1,57 @@
+"""
+Conditional GET for read endpoints.
+
+`conditional_get` wraps Django's `condition` decorator: a per-view version function runs before
+the view, and If-None-Match / If-Modified-Since are answered with a 304 without building the body.
+A version function returning None opts out (missing object, unauthorized request, import still
+running), so the view answers as usual. Cache-Control is added to 200 and 304 responses unless the
+view set its own.
+"""
+import functools
+import os
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'True') == 'True'
+# How long browsers may reuse public responses before revalidating them
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv('HTTP_CACHE_MAX_AGE_SECONDS', '60'))
+
+# (etag, last_modified) of the response a request would get, or None to skip validation
+Version = Optional[Tuple[str, Optional[datetime]]]
+
+
+def version_tag(*parts: object) -> str:
+    """ETag value from the parts that identify a response's version; datetimes in microseconds."""
+    return '-'.join(str(int(part.timestamp() * 1_000_000)) if isinstance(part, datetime) else str(part) for part in parts)
+
+
+def conditional_get(version_func: Callable[..., Version], **cache_control):
+    """
+    View decorator (wrap `get` with method_decorator). `version_func` receives the request and URL
+    kwargs and runs once per request; `cache_control` are patch_cache_control() arguments.
+    """
+    def decorator(view_func):
+        def version(request, *args, **kwargs) -> Tuple[Optional[str], Optional[datetime]]:
+            if not hasattr(request, '_http_cache_version'):
+                request._http_cache_version = version_func(request, *args, **kwargs) or (None, None)
+            return request._http_cache_version
+
+        conditional_view = condition(
+            etag_func=lambda request, *args, **kwargs: version(request, *args, **kwargs)[0],
+            last_modified_func=lambda request, *args, **kwargs: version(request, *args, **kwargs)[1],
+        )(view_func)
+
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not HTTP_CACHE_ENABLED:
+                return view_func(request, *args, **kwargs)
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code in (200, 304) and not response.has_header('Cache-Control'):
+                patch_cache_control(response, **cache_control)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,128 @@
+"""
+Token-bucket rate limiting for the token-protected endpoints.
+
+Buckets are RateLimitBucket rows, so every worker (and every host on the same database) shares the
+quota. Taking a token is one conditional UPDATE that refills and decrements the bucket in SQL, so
+concurrent workers can't both spend the last token. A client's first request inserts its bucket;
+buckets idle long enough to be full again are purged then, since a missing bucket counts as full.
+A request may cost several tokens: a batch search pays one per search it runs.
+"""
+import functools
+import hashlib
+import math
+import os
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.db.models.lookups import GreaterThanOrEqual
+from django.http import JsonResponse
+
+from .timing_utils import metrics
+
+
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True') == 'True'
+# Behind a reverse proxy every request comes from the proxy; name the header carrying the client IP
+# (e.g. X-Real-IP, set by docker/nginx.conf). Only set it when the proxy overwrites that header.
+RATE_LIMIT_CLIENT_IP_HEADER = os.getenv('RATE_LIMIT_CLIENT_IP_HEADER')
+
+
+def _quota(scope: str, burst: int, per_minute: int) -> Tuple[int, float]:
+    env_scope = scope.upper().replace('-', '_')
+    return (
+        int(os.getenv(f'RATE_LIMIT_{env_scope}_BURST', str(burst))),
+        int(os.getenv(f'RATE_LIMIT_{env_scope}_PER_MINUTE', str(per_minute))) / 60.0,
+    )
+
+
+# scope -> (bucket capacity, tokens refilled per second). Batch tokens are searches, so the
+# capacity must cover the largest batch allowed (FLIGHT_BATCH_HTTP_MAX_SIZE)
+RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    'flight-search': _quota('flight-search', 20, 60),
+    'flight-batch': _quota('flight-batch', 200, 200),
+    'price-history': _quota('price-history', 30, 120),
+    'logs': _quota('logs', 30, 120),
+}
+
+metrics.register_counter('rate_limit_requests_total', 'Requests checked by the rate limiter, by scope and outcome (allowed/limited).')
+
+
+def client_identity(request, valid_token: str) -> str:
+    """
+    Clients presenting the valid token get a bucket per token and IP; everyone else is limited per
+    IP, so rotating bogus tokens doesn't buy a fresh bucket.
+    """
+    ip = (RATE_LIMIT_CLIENT_IP_HEADER and request.headers.get(RATE_LIMIT_CLIENT_IP_HEADER)) or request.META.get('REMOTE_ADDR', 'unknown')
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header == f"Token {valid_token}":
+        return f"token:{hashlib.sha256(auth_header.encode()).hexdigest()[:16]}:{ip}"
+    return f"ip:{ip}"
+
+
+def take_token(scope: str, identity: str, cost: int = 1) -> Tuple[bool, float]:
+    """
+    Takes `cost` tokens from the bucket. Returns (allowed, seconds until enough tokens are available);
+    the wait is infinite when `cost` exceeds the bucket's capacity.
+    """
+    from core.models.rate_limit_bucket_model import RateLimitBucket
+
+    capacity, refill_per_second = RATE_LIMITS[scope]
+    if cost > capacity:
+        return False, math.inf
+    key = f"{scope}:{identity}"
+    now = time.time()
+    buckets = RateLimitBucket.objects.filter(key=key)
+
+    refilled = Least(Value(float(capacity)), F('tokens') + (Value(now) - F('updated_at')) * Value(refill_per_second))
+    if buckets.filter(GreaterThanOrEqual(refilled, cost)).update(tokens=refilled - cost, updated_at=now):
+        return True, 0.0
+
+    bucket = buckets.values_list('tokens', 'updated_at').first()
+    if bucket is None:
+        _purge_full_buckets(now)
+        try:
+            with transaction.atomic():
+                RateLimitBucket.objects.create(key=key, tokens=capacity - cost, updated_at=now)
+        except IntegrityError:
+            # Another worker created it first
+            return take_token(scope, identity, cost)
+        return True, 0.0
+
+    tokens, updated_at = bucket
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    return False, max(0.0, (cost - tokens) / refill_per_second)
+
+
+def _purge_full_buckets(now: float) -> None:
+    from core.models.rate_limit_bucket_model import RateLimitBucket
+
+    longest_refill = max(capacity / refill_per_second for capacity, refill_per_second in RATE_LIMITS.values())
+    RateLimitBucket.objects.filter(updated_at__lt=now - longest_refill).delete()
+
+
+def rate_limited(scope: str, valid_token: str, cost: Optional[Callable[..., int]] = None):
+    """
+    View decorator (wrap `dispatch` with method_decorator) that answers 429 with Retry-After once
+    the client's bucket for `scope` is empty, before the view authenticates, logs or calls upstream.
+    `cost` receives the request and returns how many tokens it takes (default 1).
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not RATE_LIMIT_ENABLED:
+                return view_func(request, *args, **kwargs)
+
+            tokens = cost(request) if cost else 1
+            allowed, retry_after = take_token(scope, client_identity(request, valid_token), tokens)
+            metrics.increment('rate_limit_requests_total', scope=scope, outcome='allowed' if allowed else 'limited')
+            if allowed:
+                return view_func(request, *args, **kwargs)
+            if math.isinf(retry_after):
+                return JsonResponse({'error': f'This request needs {tokens} tokens, more than the rate limit allows at once.'}, status=429)
+            response = JsonResponse({'error': 'Too many requests. Try again later.'}, status=429)
+            response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,149 @@
+"""Stale-while-revalidate cache for flight search results."""
+import datetime
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+from .fee_schedule_utils import fee_schedule_version
+from .logging_utils import log_warning
+
+
+SEARCH_CACHE_PREFIX = 'flight-search'
+
+# A route searched at least POPULAR_ROUTE_MIN_HITS times inside the window is "popular"
+POPULAR_ROUTE_MIN_HITS = int(os.getenv('FLIGHT_CACHE_POPULAR_MIN_HITS', '20'))
+POPULARITY_WINDOW_SECONDS = int(os.getenv('FLIGHT_CACHE_POPULARITY_WINDOW_SECONDS', '3600'))
+
+# (fresh_seconds, stale_seconds) per popularity tier. Within `fresh` the entry is served as is,
+# within `fresh + stale` it is served immediately and refreshed in the background.
+STALENESS_BOUNDS = {
+    'popular': (
+        int(os.getenv('FLIGHT_CACHE_POPULAR_FRESH_SECONDS', '60')),
+        int(os.getenv('FLIGHT_CACHE_POPULAR_STALE_SECONDS', '600')),
+    ),
+    'default': (
+        int(os.getenv('FLIGHT_CACHE_FRESH_SECONDS', '300')),
+        int(os.getenv('FLIGHT_CACHE_STALE_SECONDS', '1800')),
+    ),
+}
+
+# How old an entry may be and still be served when the upstream API is down
+STALE_IF_ERROR_SECONDS = int(os.getenv('FLIGHT_CACHE_STALE_IF_ERROR_SECONDS', '86400'))
+
+REFRESH_LOCK_SECONDS = 30
+
+
+def is_process_local_cache() -> bool:
+    """True when cache entries written here can't be seen by other processes (e.g. the gunicorn workers)."""
+    return isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def search_cache_key(origin: str, destination: str, departure_date: str, return_date: str) -> str:
+    """
+    Results are priced with the fee schedule, so its version is part of the key: a rule change
+    leaves older entries unread (they expire on their own) instead of serving outdated prices.
+    """
+    return (
+        f"{SEARCH_CACHE_PREFIX}:{origin.upper()}:{destination.upper()}:{departure_date}:{return_date}"
+        f":fees-{fee_schedule_version()}"
+    )
+
+
+def route_tier(origin: str, destination: str, count_hit: bool = True) -> str:
+    """Returns the popularity tier of a route, counting the current search as a hit."""
+    counter_key = f"{SEARCH_CACHE_PREFIX}:hits:{origin.upper()}:{destination.upper()}"
+    if count_hit:
+        cache.add(counter_key, 0, POPULARITY_WINDOW_SECONDS)
+        try:
+            hits = cache.incr(counter_key)
+        except ValueError:
+            # The counter expired between add() and incr()
+            hits = 1
+            cache.set(counter_key, hits, POPULARITY_WINDOW_SECONDS)
+    else:
+        hits = cache.get(counter_key, 0)
+    return 'popular' if hits >= POPULAR_ROUTE_MIN_HITS else 'default'
+
+
+def store_search_result(key: str, result: Dict[str, Any], tier: str) -> Dict[str, Any]:
+    fresh_seconds, stale_seconds = STALENESS_BOUNDS[tier]
+    entry = {'result': result, 'cached_at': time.time()}
+    cache.set(key, entry, max(fresh_seconds + stale_seconds, STALE_IF_ERROR_SECONDS))
+    return entry
+
+
+def is_search_fresh(key: str, tier: str) -> bool:
+    entry = cache.get(key)
+    return bool(entry) and time.time() - entry['cached_at'] <= STALENESS_BOUNDS[tier][0]
+
+
+def _with_freshness(entry: Dict[str, Any], freshness: str, age: float) -> Dict[str, Any]:
+    result = dict(entry['result'])
+    result['summary'] = {
+        **result.get('summary', {}),
+        'freshness': freshness,
+        'age_seconds': int(age),
+        'fetched_at': datetime.datetime.fromtimestamp(entry['cached_at'], tz=datetime.timezone.utc).isoformat(),
+    }
+    return result
+
+
+def _refresh(key: str, compute: Callable[[], Dict[str, Any]], tier: str) -> None:
+    try:
+        store_search_result(key, compute(), tier)
+    except ConnectionError as e:
+        log_warning('core.utils.search_cache_utils', f"Background refresh failed for {key}: {str(e)}", {'key': key, 'error': str(e)})
+    finally:
+        cache.delete(f"{key}:refreshing")
+        connections.close_all()
+
+
+def schedule_refresh(key: str, compute: Callable[[], Dict[str, Any]], tier: str) -> bool:
+    """Refreshes an entry in a background thread. Only one refresh per key runs at a time."""
+    if not cache.add(f"{key}:refreshing", True, REFRESH_LOCK_SECONDS):
+        return False
+    threading.Thread(target=_refresh, args=(key, compute, tier), daemon=True).start()
+    return True
+
+
+def get_or_refresh_search(
+    key: str,
+    tier: str,
+    compute: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Serves a cached search result according to its age:
+    - fresh: returned as is;
+    - stale: returned immediately while a background thread refreshes it;
+    - expired or missing: recomputed, falling back to the old entry if the upstream is down.
+    The `summary` of the returned payload carries `freshness`, `age_seconds` and `fetched_at`.
+    """
+    fresh_seconds, stale_seconds = STALENESS_BOUNDS[tier]
+    entry: Optional[Dict[str, Any]] = cache.get(key)
+    age = time.time() - entry['cached_at'] if entry else None
+
+    if entry and age <= fresh_seconds:
+        return _with_freshness(entry, 'fresh', age)
+    if entry and age <= fresh_seconds + stale_seconds:
+        schedule_refresh(key, compute, tier)
+        return _with_freshness(entry, 'stale', age)
+
+    try:
+        result = compute()
+    except ConnectionError as e:
+        if entry and age <= STALE_IF_ERROR_SECONDS:
+            log_warning(
+                'core.utils.search_cache_utils',
+                f"Serving stale search result for {key} because the upstream API is unavailable",
+                {'key': key, 'age_seconds': int(age), 'error': str(e)}
+            )
+            return _with_freshness(entry, 'stale-if-error', age)
+        raise
+
+    return _with_freshness(store_search_result(key, result, tier), 'fresh', 0)
@@ -0,0 +1,55 @@
+"""
+Process-local, read-only snapshots of database data, invalidated across processes through the cache.
+
+A snapshot is built once per process (in the gunicorn master when preloading, so forked workers share
+its pages) and rebuilt when the version stamp stored in the Django cache changes: `invalidate()` in any
+process replaces the stamp. `max_age_seconds` bounds staleness when processes don't share a cache
+backend or a change bypasses invalidation (e.g. Queryset.update()).
+"""
+import threading
+import time
+import uuid
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+from django.core.cache import cache
+
+
+T = TypeVar('T')
+
+
+class VersionedSnapshot(Generic[T]):
+    def __init__(self, version_key: str, build: Callable[[], T], max_age_seconds: int):
+        self.version_key = version_key
+        self.build = build
+        self.max_age_seconds = max_age_seconds
+        # (version, built_at, value)
+        self._current: Optional[Tuple[str, float, T]] = None
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        """The current version stamp, the same in every process sharing the cache."""
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self) -> T:
+        """The current value, rebuilt first if it was invalidated or is older than the max age."""
+        version = self.version()
+        current = self._current
+        if current is not None and current[0] == version and time.monotonic() - current[1] < self.max_age_seconds:
+            return current[2]
+
+        with self._lock:
+            if self._current is not None and self._current is not current:
+                # Rebuilt by another thread while this one waited
+                return self._current[2]
+            value = self.build()
+            self._current = (version, time.monotonic(), value)
+            return value
+
+    def invalidate(self) -> None:
+        """Marks every process's snapshot as outdated (through the shared cache) and drops this one."""
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+        self._current = None
@@ -0,0 +1,48 @@
+"""Process start-up steps run once in the gunicorn master before workers are forked (see gunicorn.conf.py)."""
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import get_resolver
+
+from .airport_index_utils import get_airport_index
+from .fee_schedule_utils import get_fee_schedule
+from .logging_utils import log_warning
+
+
+def pending_migrations(database: str = DEFAULT_DB_ALIAS) -> list:
+    """Unapplied migrations, from two cheap queries against django_migrations."""
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def migrate_if_needed() -> bool:
+    """
+    Runs `migrate` only when migrations are pending; a no-op migrate still loads every migration
+    module and fires post_migrate (content types, permissions) on each start. Returns whether it ran.
+    """
+    try:
+        if not pending_migrations():
+            return False
+        call_command('migrate', interactive=False, verbosity=1)
+        return True
+    finally:
+        connections.close_all()
+
+
+def warm_up() -> None:
+    """
+    Imports everything a first request would (URLconf, views, services, the lazily imported HTTP
+    client) and builds the airport index and fee schedule, so forked workers start with them in shared pages.
+    Database connections are closed afterwards: they must not be shared across forks.
+    """
+    get_resolver().url_patterns
+    from core import services
+    services._requests()
+    try:
+        get_airport_index()
+        get_fee_schedule()
+    except Exception as e:
+        # e.g. an empty or unreachable database; workers build them on first use instead
+        log_warning('core.utils.startup_utils', f"Airport index and fee schedule warm-up skipped: {str(e)}", {'error': str(e)})
+    finally:
+        connections.close_all()
@@ -0,0 +1,193 @@
+"""
+Per-request phase timings and in-process metrics.
+
+RequestTimingMiddleware opens a RequestTimings for each request; code inside it wraps its phases in
+`timed_phase(name)`. Every phase is also observed into a process-wide histogram, so the same hooks
+feed the Server-Timing header and the Prometheus text rendered at /metrics. Recording a phase costs
+two perf_counter() calls and one short lock; there is no I/O on the request path.
+
+Metrics are per process: with several gunicorn workers each one exposes its own series.
+"""
+import bisect
+import contextlib
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'True') == 'True'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelSet, int]] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+
+    def register_histogram(self, name: str, help_text: str, buckets: Sequence[float] = DURATION_BUCKETS) -> None:
+        with self._lock:
+            self._histograms.setdefault(name, {})
+            self._help[name] = help_text
+            self._buckets[name] = buckets
+
+    def register_counter(self, name: str, help_text: str) -> None:
+        with self._lock:
+            self._counters.setdefault(name, {})
+            self._help[name] = help_text
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def counter_value(self, name: str, **labels: str) -> int:
+        with self._lock:
+            return self._counters[name].get(tuple(sorted(labels.items())), 0)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets[name])
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            for series in (*self._histograms.values(), *self._counters.values()):
+                series.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, counters in self._counters.items():
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(counters.items()):
+                    lines.append(f"{name}{_labels(labels)} {value}")
+            for name, series in self._histograms.items():
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels: LabelSet, **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = MetricsRegistry()
+metrics.register_histogram('http_request_duration_seconds', 'Time spent producing the response, by view, method and status.')
+metrics.register_histogram('http_request_db_queries', 'Database queries executed per request, by view.', QUERY_COUNT_BUCKETS)
+metrics.register_histogram('app_phase_duration_seconds', 'Time spent in instrumented phases (auth, airport lookup, upstream calls, ...).')
+
+
+class RequestTimings:
+    """Phases and database usage of one request, rendered as a Server-Timing header."""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float, Optional[str]]] = []
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+    def add(self, name: str, seconds: float, description: Optional[str] = None) -> None:
+        self.phases.append((name, seconds, description))
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook counting the queries run in the request thread."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.db_queries += 1
+
+    def server_timing(self, total_seconds: float) -> str:
+        entries = [
+            f'{name};dur={seconds * 1000:.1f}' + (f';desc="{description}"' if description else '')
+            for name, seconds, description in self.phases
+        ]
+        entries.append(f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"')
+        entries.append(f'total;dur={total_seconds * 1000:.1f}')
+        return ', '.join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+def start_request_timings() -> Tuple[RequestTimings, object]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish_request_timings(token) -> None:
+    _current.reset(token)
+
+
+def current_request_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def timed_phase(name: str, description: Optional[str] = None) -> Iterator[None]:
+    """
+    Times a block as phase `name`. Outside a request (batch workers, background refreshes, commands)
+    the phase still feeds the histogram but no header.
+    """
+    if not REQUEST_TIMING_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe('app_phase_duration_seconds', elapsed, phase=name)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, elapsed, description)
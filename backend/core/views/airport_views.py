@@ -1,23 +1,38 @@
-from dotenv import load_dotenv
+from datetime import timedelta, timezone as dt_timezone
 
+from django.db.models import Min
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
+from core.models.airport_change_model import AirportChange
 from core.models.airport_model import Airport
+from core.models.airport_tombstone_model import AirportTombstone
+from core.models.import_log_model import ImportLogModel
 from core.services import import_airports_from_api
+from core.utils.airport_index_utils import AUTOCOMPLETE_MAX_RESULTS, autocomplete_airports
+from core.utils.http_cache_utils import HTTP_CACHE_MAX_AGE_SECONDS, conditional_get, version_tag
 from core.utils.logging_utils import log_info, log_error
+from core.utils.timing_utils import timed_phase
+from core.views.import_log_views import airport_changes_response
 
 
-load_dotenv()
+def airport_version(request, *args, **kwargs):
+    modified_on = Airport.objects.filter(iata=kwargs['iata'].upper()).values_list('modified_on', flat=True).first()
+    if modified_on is None:
+        return None
+    return version_tag(kwargs['iata'].upper(), modified_on), modified_on
 
 
+@method_decorator(conditional_get(airport_version, public=True, max_age=HTTP_CACHE_MAX_AGE_SECONDS), name='get')
 class AirportDetailView(View):
     def get(self, request, *args, **kwargs):
         iata = kwargs.get('iata')
-        airport = get_object_or_404(Airport, iata=iata)
+        airport = get_object_or_404(Airport, iata=iata.upper())
         data = {
             'iata': airport.iata,
             'city': airport.city,
@@ -27,6 +42,16 @@ class AirportDetailView(View):
         }
         return JsonResponse(data)
 
+class AirportChangesView(View):
+    """Field-level change history of one airport across imports, newest first."""
+
+    def get(self, request, *args, **kwargs):
+        iata = kwargs.get('iata').upper()
+        changes = AirportChange.objects.filter(iata=iata)
+        if not changes.exists() and not Airport.objects.filter(iata=iata).exists():
+            return JsonResponse({'error': 'Airport not found'}, status=404)
+        return airport_changes_response(request, changes)
+
 # The outside api handles authentication via POST parameters, so we exempt CSRF for this view specifically
 @method_decorator(csrf_exempt, name='dispatch')
 class AirportImportView(View):
@@ -55,4 +80,89 @@ class AirportListView(View):
             }
             for airport in airports
         ]
-        return JsonResponse(data, safe=False)
\ No newline at end of file
+        return JsonResponse(data, safe=False)
+
+
+# Imports still running after this long are assumed to have crashed and no longer hold the sync cursor back
+SYNC_RUNNING_IMPORT_WINDOW = timedelta(hours=1)
+
+
+def sync_upper_bound():
+    """
+    Newest point a sync response can safely cover. An import writes every airport in one transaction
+    with timestamps from when it started, so while one is running the cursor stays before it.
+    """
+    now = timezone.now()
+    running_since = ImportLogModel.objects.filter(
+        end_time__isnull=True,
+        start_time__gte=now - SYNC_RUNNING_IMPORT_WINDOW,
+    ).aggregate(start=Min('start_time'))['start']
+    return min(now, running_since) if running_since else now
+
+
+class AirportSyncView(View):
+    """
+    Delta sync for clients that keep a local copy of the airport list. Without a cursor every airport
+    is returned; with `?since=<next_cursor>` (or `?since_import=<import id>`) only the airports created,
+    updated or deleted after it. Poll with the returned `next_cursor`; an airport can occasionally be
+    sent twice, so clients should upsert.
+    """
+
+    def get(self, request, *args, **kwargs):
+        since = None
+        if request.GET.get('since_import'):
+            try:
+                import_id = int(request.GET['since_import'])
+            except ValueError:
+                return JsonResponse({'error': "'since_import' must be an import id."}, status=400)
+            import_log = ImportLogModel.objects.filter(id=import_id).values('start_time', 'end_time').first()
+            if not import_log:
+                return JsonResponse({'error': 'Import not found'}, status=404)
+            since = import_log['end_time'] or import_log['start_time']
+        elif request.GET.get('since'):
+            since = parse_datetime(request.GET['since'])
+            if since is None:
+                return JsonResponse({'error': "'since' must be a cursor returned by this endpoint (ISO 8601 timestamp)."}, status=400)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        upper_bound = sync_upper_bound()
+        airports = Airport.objects.filter(modified_on__lte=upper_bound)
+        tombstones = AirportTombstone.objects.filter(deleted_at__lte=upper_bound)
+        if since is not None:
+            airports = airports.filter(modified_on__gt=since)
+            tombstones = tombstones.filter(deleted_at__gt=since)
+
+        created, updated = [], []
+        for row in airports.order_by('modified_on', 'id').values('iata', 'city', 'state', 'lat', 'lon', 'created_on', 'modified_on'):
+            created_on = row.pop('created_on')
+            (created if since is None or created_on > since else updated).append(row)
+
+        return JsonResponse({
+            'since': since,
+            # UTC with a Z suffix, so it can be passed back in a query string without escaping
+            'next_cursor': upper_bound.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            'created': created,
+            'updated': updated,
+            'deleted': list(tombstones.order_by('deleted_at', 'id').values_list('iata', flat=True)),
+        })
+
+
+class AirportAutocompleteView(View):
+    """
+    Type-ahead over IATA codes and city names (`?q=sao&limit=10`), served from the in-memory
+    airport index and ranked by how often each airport was searched.
+    """
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '')
+        try:
+            limit = int(request.GET.get('limit', 10))
+            if not 1 <= limit <= AUTOCOMPLETE_MAX_RESULTS:
+                raise ValueError
+        except ValueError:
+            return JsonResponse({'error': f"'limit' must be between 1 and {AUTOCOMPLETE_MAX_RESULTS}."}, status=400)
+
+        with timed_phase('autocomplete'):
+            airports = autocomplete_airports(query, limit)
+        return JsonResponse({'query': query, 'results': [airport._asdict() for airport in airports]})
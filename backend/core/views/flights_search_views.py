@@ -1,25 +1,47 @@
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+import json
 import os
 
-from core.services import find_flight_combinations
+from core.services import FLIGHT_BATCH_HTTP_MAX_SIZE, FLIGHT_SEARCH_LOG_MESSAGE, find_flight_combinations, search_flights_batch
+from core.utils.fare_history_utils import cheapest_fares_for_route
 from core.utils.logging_utils import log_info, log_debug, log_warning, log_error
+from core.utils.rate_limit_utils import rate_limited
+from core.utils.timing_utils import timed_phase
 
 
 API_AUTH_TOKEN = os.getenv("MOCK_API_KEY")
 
 
+def batch_size(request) -> int:
+    """
+    Rate-limit cost of a batch request: one token per search it will run. Bodies the view rejects
+    with a 400 (malformed, or more than FLIGHT_BATCH_HTTP_MAX_SIZE searches) cost 1.
+    """
+    try:
+        searches = json.loads(request.body or b'{}').get('searches')
+    except (ValueError, AttributeError):
+        return 1
+    if not isinstance(searches, list) or len(searches) > FLIGHT_BATCH_HTTP_MAX_SIZE:
+        return 1
+    return max(1, len(searches))
+
+
 # The outside api handles authentication via POST parameters, so we exempt CSRF for this view specifically
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(rate_limited('flight-search', API_AUTH_TOKEN), name='dispatch')
 class FlightSearchView(View):
     def get(self, request, *args, **kwargs):
 
-        auth_header = request.headers.get('Authorization')
-        expected_header = f"Token {API_AUTH_TOKEN}"
+        with timed_phase('auth'):
+            auth_header = request.headers.get('Authorization')
+            expected_header = f"Token {API_AUTH_TOKEN}"
+            authorized = auth_header and auth_header == expected_header
 
-        if not auth_header or auth_header != expected_header:
+        if not authorized:
             log_info('core.views.flights_search_views', f'Unauthorized access attempt to flight search from {request.META.get("REMOTE_ADDR")}')
             return JsonResponse({'error': 'Unauthorized'}, status=401)
 
@@ -35,7 +57,16 @@ class FlightSearchView(View):
                 departure_date_str=departure_date,
                 return_date_str=return_date
             )
-            return JsonResponse(flight_data, status=200, json_dumps_params={'indent': 2})
+            # Search frequency from these entries drives the cache warm-up (warm_flight_cache command)
+            log_info('core.views.flights_search_views', FLIGHT_SEARCH_LOG_MESSAGE, {
+                'origin': origin.upper(),
+                'destination': destination.upper(),
+                'departure_date': departure_date,
+                'return_date': return_date,
+                'freshness': flight_data['summary'].get('freshness'),
+            })
+            with timed_phase('serialize'):
+                return JsonResponse(flight_data, status=200, json_dumps_params={'indent': 2})
 
         except ValueError as e:
             log_debug('core.views.flights_search_views', f'Validation error in flight search: {str(e)}')
@@ -45,4 +76,73 @@ class FlightSearchView(View):
             return JsonResponse({'error': f'External API Error: {str(e)}'}, status=503)
         except Exception as e:
             log_error('core.views.flights_search_views', f'Unhandled exception in FlightSearchView: {str(e)}', {'error': str(e)})
-            return JsonResponse({'error': 'An unexpected internal server error occurred.'}, status=500)
\ No newline at end of file
+            return JsonResponse({'error': 'An unexpected internal server error occurred.'}, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(rate_limited('flight-batch', API_AUTH_TOKEN, cost=batch_size), name='dispatch')
+class FlightBatchSearchView(View):
+    """
+    Runs many searches in one request. Body: {"searches": [{"from", "to", "departureDate", "returnDate"}, ...],
+    "concurrency": <optional int>}. Results are streamed as NDJSON, one line per search in completion order.
+    At most FLIGHT_BATCH_HTTP_MAX_SIZE searches, so the stream ends before the worker timeout.
+    """
+
+    def post(self, request, *args, **kwargs):
+
+        auth_header = request.headers.get('Authorization')
+        expected_header = f"Token {API_AUTH_TOKEN}"
+
+        if not auth_header or auth_header != expected_header:
+            log_info('core.views.flights_search_views', f'Unauthorized access attempt to batch flight search from {request.META.get("REMOTE_ADDR")}')
+            return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+        try:
+            payload = json.loads(request.body or b'{}')
+            searches = payload.get('searches')
+            concurrency = payload.get('concurrency')
+            if not isinstance(searches, list) or not searches:
+                raise ValueError("'searches' must be a non-empty list.")
+            if len(searches) > FLIGHT_BATCH_HTTP_MAX_SIZE:
+                raise ValueError(
+                    f"A batch request can hold at most {FLIGHT_BATCH_HTTP_MAX_SIZE} searches; "
+                    "run larger batches with the batch_search_flights command."
+                )
+            if concurrency is not None and (not isinstance(concurrency, int) or concurrency < 1):
+                raise ValueError("'concurrency' must be a positive integer.")
+            results = search_flights_batch(searches, concurrency=concurrency)
+        except (ValueError, AttributeError) as e:
+            log_debug('core.views.flights_search_views', f'Validation error in batch flight search: {str(e)}')
+            return JsonResponse({'error': str(e) if isinstance(e, ValueError) else 'Body must be a JSON object.'}, status=400)
+
+        log_info('core.views.flights_search_views', f'Batch flight search started with {len(searches)} searches')
+        return StreamingHttpResponse(
+            (json.dumps(line, cls=DjangoJSONEncoder) + '\n' for line in results),
+            content_type='application/x-ndjson'
+        )
+
+
+@method_decorator(rate_limited('price-history', API_AUTH_TOKEN), name='dispatch')
+class FarePriceHistoryView(View):
+    """Cheapest fares recorded for a route over the last `days` days (default 30)."""
+
+    def get(self, request, *args, **kwargs):
+
+        auth_header = request.headers.get('Authorization')
+        expected_header = f"Token {API_AUTH_TOKEN}"
+
+        if not auth_header or auth_header != expected_header:
+            return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+        origin = request.GET.get('from')
+        destination = request.GET.get('to')
+        if not origin or not destination:
+            return JsonResponse({'error': "Parameters 'from' and 'to' are required."}, status=400)
+        try:
+            days = int(request.GET.get('days', 30))
+            if days < 1:
+                raise ValueError
+        except ValueError:
+            return JsonResponse({'error': "'days' must be a positive integer."}, status=400)
+
+        return JsonResponse(cheapest_fares_for_route(origin, destination, days), status=200)
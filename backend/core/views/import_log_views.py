@@ -1,28 +1,124 @@
+import base64
+import binascii
+import datetime
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
 from django.views import View
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from core.models.airport_change_model import AirportChange
 from core.models.import_log_model import ImportLogModel
+from core.utils.http_cache_utils import HTTP_CACHE_MAX_AGE_SECONDS, conditional_get, version_tag
 
 
-class ImportLogListView(View):
-    def get(self, request, *args, **kwargs):
-        imports = ImportLogModel.objects.all()
-        data = [
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# The IATA lists can hold thousands of codes per run, so the list only returns this summary projection
+SUMMARY_FIELDS = ('id', 'start_time', 'end_time', 'status', 'airports_created', 'airports_updated', 'airports_deleted', 'airports_rejected', 'details')
+
+
+def encode_cursor(start_time, import_id):
+    raw = f"{start_time.isoformat()}|{import_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        start_time, import_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.datetime.fromisoformat(start_time), int(import_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError('Invalid cursor.')
+
+
+def airport_changes_response(request, changes):
+    """Paginated (`page`, `page_size`) JSON list of AirportChange rows, optionally filtered by `change_type`."""
+    change_type = request.GET.get('change_type')
+    if change_type:
+        if change_type.upper() not in AirportChange.ChangeType.values:
+            return JsonResponse({'error': f'Invalid change type. Valid options: {", ".join(AirportChange.ChangeType.values)}'}, status=400)
+        changes = changes.filter(change_type=change_type.upper())
+
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid page number'}, status=400)
+    try:
+        page_size = min(int(request.GET.get('page_size', 100)), 1000)
+        if page_size < 1:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'error': 'Invalid page size'}, status=400)
+
+    paginator = Paginator(changes, page_size)
+    page_obj = paginator.get_page(page)
+    return JsonResponse({
+        'count': paginator.count,
+        'total_pages': paginator.num_pages,
+        'current_page': page_obj.number,
+        'page_size': page_size,
+        'results': [
             {
-                'id': imp.id,
-                'start_time': imp.start_time,
-                'end_time': imp.end_time,
-                'status': imp.status,
-                'airports_created': imp.airports_created,
-                'airports_updated': imp.airports_updated,
-                'created_iatas': imp.created_iatas,
-                'updated_iatas': imp.updated_iatas,
-                'details': imp.details,
+                'import_id': change.import_log_id,
+                'iata': change.iata,
+                'change_type': change.change_type,
+                'changes': change.changes,
+                'changed_at': change.changed_at,
             }
-            for imp in imports
-        ]
-        return JsonResponse(data, safe=False)
+            for change in page_obj
+        ],
+    })
+
 
+class ImportLogListView(View):
+    """
+    Keyset-paginated list of import runs, newest first. Pass the returned `next_cursor` as
+    `?cursor=` to get the next page; `page_size` defaults to 50 (max 200).
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            page_size = min(int(request.GET.get('page_size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+            if page_size < 1:
+                raise ValueError
+        except ValueError:
+            return JsonResponse({'error': 'Invalid page size'}, status=400)
+
+        imports = ImportLogModel.objects.order_by('-start_time', '-id')
+
+        cursor = request.GET.get('cursor')
+        if cursor:
+            try:
+                start_time, import_id = decode_cursor(cursor)
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            imports = imports.filter(Q(start_time__lt=start_time) | Q(start_time=start_time, id__lt=import_id))
+
+        # One extra row tells whether there is a next page without a COUNT(*)
+        rows = list(imports.values(*SUMMARY_FIELDS)[:page_size + 1])
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1]['start_time'], rows[-1]['id'])
+
+        return JsonResponse({
+            'page_size': page_size,
+            'next_cursor': next_cursor,
+            'results': rows,
+        })
+
+def import_log_version(request, *args, **kwargs):
+    # A finished import never changes again; a running one (no end_time yet) is not validated
+    end_time = ImportLogModel.objects.filter(id=kwargs['id']).values_list('end_time', flat=True).first()
+    if end_time is None:
+        return None
+    return version_tag('import', kwargs['id'], end_time), end_time
+
+
+@method_decorator(conditional_get(import_log_version, public=True, max_age=HTTP_CACHE_MAX_AGE_SECONDS), name='get')
 class ImportLogDetailView(View):
     def get(self, request, *args, **kwargs):
         import_id = kwargs.get('id')
@@ -34,8 +130,24 @@ class ImportLogDetailView(View):
             'status': import_instance.status,
             'airports_created': import_instance.airports_created,
             'airports_updated': import_instance.airports_updated,
+            'airports_rejected': import_instance.airports_rejected,
+            'airports_deleted': import_instance.airports_deleted,
             'created_iatas': import_instance.created_iatas,
             'updated_iatas': import_instance.updated_iatas,
+            'deleted_iatas': import_instance.deleted_iatas,
+            'rejected_records': import_instance.rejected_records,
             'details': import_instance.details,
         }
-        return JsonResponse(data)
\ No newline at end of file
+        response = JsonResponse(data)
+        if import_instance.end_time is None:
+            # Still running: clients must come back for progress
+            patch_cache_control(response, no_cache=True)
+        return response
+
+
+class ImportLogChangesView(View):
+    """Field-level airport changes made by one import run."""
+
+    def get(self, request, *args, **kwargs):
+        import_instance = get_object_or_404(ImportLogModel.objects.only('id'), id=kwargs.get('id'))
+        return airport_changes_response(request, import_instance.airport_changes.order_by('iata'))
@@ -1,22 +1,41 @@
 from django.http import JsonResponse
+from django.utils.decorators import method_decorator
 from django.views import View
 from django.core.paginator import Paginator
+from django.utils import timezone
 import os
 from datetime import datetime, timedelta
 
 from core.models.log_model import ApplicationLog
+from core.utils.http_cache_utils import conditional_get, version_tag
+from core.utils.rate_limit_utils import rate_limited
 
 
 API_AUTH_TOKEN = os.getenv("MOCK_API_KEY")
 
 
+def is_authorized(request):
+    auth_header = request.headers.get('Authorization')
+    return bool(auth_header) and auth_header == f"Token {API_AUTH_TOKEN}"
+
+
+def logs_version(request, *args, **kwargs):
+    # Logs are append-only, so the newest row versions every page and filter. Unauthorized
+    # requests get no validators (and no query); the view answers them with a 401.
+    if not is_authorized(request):
+        return None
+    latest = ApplicationLog.objects.order_by('-id').values_list('id', 'timestamp').first()
+    if latest is None:
+        return version_tag('logs', 0), None
+    return version_tag('logs', *latest), latest[1]
+
+
+@method_decorator(rate_limited('logs', API_AUTH_TOKEN), name='dispatch')
+@method_decorator(conditional_get(logs_version, private=True, no_cache=True), name='get')
 class LogsView(View):
     def get(self, request, *args, **kwargs):
         
-        auth_header = request.headers.get('Authorization')
-        expected_header = f"Token {API_AUTH_TOKEN}"
-        
-        if not auth_header or auth_header != expected_header:
+        if not is_authorized(request):
             return JsonResponse({'error': 'Unauthorized'}, status=401)
         
         
@@ -41,9 +60,11 @@ class LogsView(View):
         try:
             if date_str:
                 
-                target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                # A half-open range instead of timestamp__date keeps the timestamp indexes usable
+                target_date = timezone.make_aware(datetime.strptime(date_str, '%Y-%m-%d'))
                 logs = logs.filter(
-                    timestamp__date=target_date
+                    timestamp__gte=target_date,
+                    timestamp__lt=target_date + timedelta(days=1)
                 )
             else:
                
@@ -0,0 +1,27 @@
+import os
+
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+
+from core.utils.timing_utils import metrics
+
+
+# Scrapers either present `Authorization: Bearer <METRICS_TOKEN>` or connect from an allowed address.
+# The default only admits local scrapes: the backend port is published, so the endpoint is reachable.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = {ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()}
+
+
+def can_scrape(request) -> bool:
+    if METRICS_TOKEN and request.headers.get('Authorization') == f"Bearer {METRICS_TOKEN}":
+        return True
+    return request.META.get('REMOTE_ADDR') in METRICS_ALLOWED_IPS
+
+
+class MetricsView(View):
+    """Prometheus scrape endpoint for this process's request and phase histograms."""
+
+    def get(self, request, *args, **kwargs):
+        if not can_scrape(request):
+            return JsonResponse({'error': 'Forbidden'}, status=403)
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
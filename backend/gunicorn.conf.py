@@ -0,0 +1,32 @@
+"""
+Gunicorn settings. The app is loaded once in the master (preload_app), pending migrations are
+applied, the process is warmed up and the resulting objects are moved out of the garbage
+collector's reach with gc.freeze(), so collections in the workers don't write to (and un-share)
+the copy-on-write pages they were forked with.
+"""
+import gc
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', '3'))
+# Seconds a worker may spend on one request (a streamed batch search included) before it is killed;
+# FLIGHT_BATCH_HTTP_MAX_SIZE keeps batch requests well inside it
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+# False when migrations are applied by a release step instead (several replicas starting at once)
+migrate_on_start = os.getenv('MIGRATE_ON_START', 'True') == 'True'
+
+
+def when_ready(server):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'import_airports.settings')
+    import django
+
+    django.setup()
+    from core.utils.startup_utils import migrate_if_needed, warm_up
+
+    if migrate_on_start and migrate_if_needed():
+        server.log.info("Applied pending migrations")
+    if preload_app:
+        warm_up()
+        gc.freeze()
@@ -0,0 +1,65 @@
+"""
+Environment-driven database profiles.
+
+DB_ENGINE=sqlite (default) keeps the single-file database, tuned for concurrent gunicorn workers:
+WAL journal (readers don't block the writer), synchronous=NORMAL and IMMEDIATE transactions so
+writers queue on the busy timeout instead of failing with "database is locked".
+
+DB_ENGINE=postgresql reads DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and DB_PORT and keeps connections
+open between requests (DB_CONN_MAX_AGE seconds, with health checks). DB_POOL=True switches to
+psycopg's connection pool instead (DB_POOL_MIN_SIZE/DB_POOL_MAX_SIZE), which Django requires to be
+used without persistent connections.
+"""
+import os
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL;'
+    'PRAGMA synchronous=NORMAL;'
+    'PRAGMA temp_store=MEMORY;'
+    'PRAGMA mmap_size=134217728;'
+)
+
+
+def database_config(base_dir: Path, env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Builds the `default` entry of settings.DATABASES from the environment."""
+    env = os.environ if env is None else env
+    engine = env.get('DB_ENGINE', 'sqlite').lower()
+
+    if engine in ('postgres', 'postgresql'):
+        config = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env.get('DB_NAME', 'airports'),
+            'USER': env.get('DB_USER', 'airports'),
+            'PASSWORD': env.get('DB_PASSWORD', ''),
+            'HOST': env.get('DB_HOST', 'localhost'),
+            'PORT': env.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(env.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+        if env.get('DB_POOL', 'False') == 'True':
+            config['CONN_MAX_AGE'] = 0
+            config['OPTIONS']['pool'] = {
+                'min_size': int(env.get('DB_POOL_MIN_SIZE', '2')),
+                'max_size': int(env.get('DB_POOL_MAX_SIZE', '10')),
+            }
+        return config
+
+    if engine != 'sqlite':
+        raise ValueError(f"Unsupported DB_ENGINE '{engine}'. Use 'sqlite' or 'postgresql'.")
+
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': env.get('DB_NAME', str(base_dir / 'db.sqlite3')),
+        'CONN_MAX_AGE': int(env.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': SQLITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+            # seconds a writer waits for the lock before "database is locked"
+            'timeout': int(env.get('DB_SQLITE_TIMEOUT', '20')),
+        },
+    }
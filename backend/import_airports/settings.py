@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .database import database_config
+
 load_dotenv()
 
 
@@ -54,6 +57,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.timing_middleware.RequestTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -87,13 +91,33 @@ WSGI_APPLICATION = 'import_airports.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Profiles are picked with DB_ENGINE (sqlite or postgresql), see import_airports/database.py
+
 DATABASES = {
+    'default': database_config(BASE_DIR),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Flight search results, the warm-up and the airport index / fee schedule version stamps live here.
+# The default file-based cache is shared by every process on the host (gunicorn workers and
+# management commands such as warm_flight_cache); use memcached or redis across several hosts.
+# LocMemCache is per process and only fits single-process runs. Tests and benchmarks get a private
+# cache directory (import_airports/test_runner.py), never this one.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'import-airports-cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', '10000')),
+        },
     }
 }
 
+TEST_RUNNER = 'import_airports.test_runner.IsolatedCacheTestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,41 @@
+"""
+Test runner that keeps the test suite off the live cache.
+
+The default cache is a file-based cache shared with the running server, so tests calling
+cache.clear() or storing mock search results would wipe or poison what users are served.
+`isolated_cache()` points the default cache at a private temporary directory (still file-based, so
+cross-process behaviour is unchanged) and removes it afterwards; the benchmarks use it too.
+"""
+import contextlib
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+@contextlib.contextmanager
+def isolated_cache():
+    location = tempfile.mkdtemp(prefix='import-airports-isolated-cache-')
+    default = {
+        **settings.CACHES['default'],
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': location,
+    }
+    try:
+        with override_settings(CACHES={'default': default}):
+            yield location
+    finally:
+        shutil.rmtree(location, ignore_errors=True)
+
+
+class IsolatedCacheTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._isolated_cache = contextlib.ExitStack()
+        self._isolated_cache.enter_context(isolated_cache())
+
+    def teardown_test_environment(self, **kwargs):
+        self._isolated_cache.close()
+        super().teardown_test_environment(**kwargs)
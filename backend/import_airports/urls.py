@@ -11,4 +11,5 @@ urlpatterns = [
     path('api/', include('core.routes.log_routes')),
     path('api/flights_integration/', include('core.routes.flight_search_routes')),
     path('api/logs/', include('core.routes.log_routes')),
+    path('', include('core.routes.metrics_routes')),
 ]
\ No newline at end of file
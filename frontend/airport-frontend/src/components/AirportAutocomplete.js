@@ -0,0 +1,63 @@
+import React, { useEffect, useState } from 'react';
+import { Autocomplete, TextField } from '@mui/material';
+import { autocompleteAirports } from '../services/api';
+
+const DEBOUNCE_MS = 150;
+
+/**
+ * IATA input with type-ahead on IATA codes and city names.
+ * Calls onChange with the upper-cased IATA code (typed or picked from the suggestions).
+ */
+const AirportAutocomplete = ({ name, label, value, onChange, required }) => {
+  const [options, setOptions] = useState([]);
+  const [inputValue, setInputValue] = useState(value || '');
+
+  useEffect(() => {
+    if (!inputValue) {
+      setOptions([]);
+      return undefined;
+    }
+    let active = true;
+    const timer = setTimeout(() => {
+      autocompleteAirports(inputValue)
+        .then((response) => {
+          if (active) setOptions(response.data.results);
+        })
+        .catch(() => {
+          if (active) setOptions([]);
+        });
+    }, DEBOUNCE_MS);
+    return () => {
+      active = false;
+      clearTimeout(timer);
+    };
+  }, [inputValue]);
+
+  return (
+    <Autocomplete
+      freeSolo
+      options={options}
+      filterOptions={(x) => x}
+      getOptionLabel={(option) => (typeof option === 'string' ? option : option.iata)}
+      renderOption={(props, option) => (
+        <li {...props} key={option.iata}>
+          <strong>{option.iata}</strong>&nbsp;— {option.city}, {option.state}
+        </li>
+      )}
+      inputValue={inputValue}
+      onInputChange={(event, newInputValue) => {
+        setInputValue(newInputValue);
+        onChange({ target: { name, value: newInputValue.toUpperCase() } });
+      }}
+      onChange={(event, option) => {
+        const iata = option ? (typeof option === 'string' ? option : option.iata).toUpperCase() : '';
+        onChange({ target: { name, value: iata } });
+      }}
+      renderInput={(params) => (
+        <TextField {...params} name={name} label={label} variant="outlined" fullWidth required={required} />
+      )}
+    />
+  );
+};
+
+export default AirportAutocomplete;
@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
 import { searchFlights } from '../services/api';
+import AirportAutocomplete from '../components/AirportAutocomplete';
 import {
   Container, Typography, Box, Paper, TextField, Button, Grid,
   CircularProgress, Alert, List, ListItem, ListItemText, Divider
@@ -63,27 +64,21 @@ const FlightSearch = () => {
         <Box component="form" onSubmit={handleSubmit}>
           <Grid container spacing={2}>
             <Grid item xs={12} sm={6}>
-              <TextField
+              <AirportAutocomplete
                 name="from"
-                label="Origin (IATA)"
-                variant="outlined"
-                fullWidth
+                label="Origin (IATA or city)"
                 required
                 value={params.from}
                 onChange={handleChange}
-                inputProps={{ maxLength: 3, style: { textTransform: 'uppercase' } }}
               />
             </Grid>
             <Grid item xs={12} sm={6}>
-              <TextField
+              <AirportAutocomplete
                 name="to"
-                label="Destination (IATA)"
-                variant="outlined"
-                fullWidth
+                label="Destination (IATA or city)"
                 required
                 value={params.to}
                 onChange={handleChange}
-                inputProps={{ maxLength: 3, style: { textTransform: 'uppercase' } }}
               />
             </Grid>
             <Grid item xs={12} sm={6}>
@@ -50,6 +50,8 @@ const LogDetail = () => {
           <DetailItem title="End" content={log.end_time ? new Date(log.end_time).toLocaleString() : 'N/A'} />
           <DetailItem title="Created" content={log.airports_created} />
           <DetailItem title="Updated" content={log.airports_updated} />
+          <DetailItem title="Deleted" content={log.airports_deleted} />
+          <DetailItem title="Rejected" content={log.airports_rejected} />
         </Grid>
         <Box sx={{ mt: 3 }}>
           <Typography variant="h6">Created IATA Codes</Typography>
@@ -63,6 +65,26 @@ const LogDetail = () => {
             {log.updated_iatas.length > 0 ? log.updated_iatas.join(', ') : 'None'}
           </Paper>
         </Box>
+        {log.deleted_iatas && log.deleted_iatas.length > 0 && (
+          <Box sx={{ mt: 2 }}>
+            <Typography variant="h6">Deleted IATA Codes</Typography>
+            <Paper variant="outlined" sx={{ p: 2, maxHeight: 150, overflow: 'auto', mt: 1, bgcolor: '#f5f5f5' }}>
+              {log.deleted_iatas.join(', ')}
+            </Paper>
+          </Box>
+        )}
+        {log.rejected_records && log.rejected_records.length > 0 && (
+          <Box sx={{ mt: 2 }}>
+            <Typography variant="h6" color="error">Rejected Records</Typography>
+            <Paper variant="outlined" sx={{ p: 2, maxHeight: 200, overflow: 'auto', mt: 1, bgcolor: '#fff0f0' }}>
+              {log.rejected_records.map((rejected) => (
+                <Typography variant="body2" key={rejected.key}>
+                  {rejected.key}: {rejected.reasons.join('; ')}
+                </Typography>
+              ))}
+            </Paper>
+          </Box>
+        )}
         {log.error_message && (
           <Box sx={{ mt: 2 }}>
             <Typography variant="h6" color="error">Error Message</Typography>
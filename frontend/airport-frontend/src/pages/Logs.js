@@ -3,7 +3,7 @@ import { getImportLogs } from '../services/api';
 import { useNavigate } from 'react-router-dom';
 import {
   Container, Typography, Box, Paper, Table, TableBody, TableCell,
-  TableContainer, TableHead, TableRow, CircularProgress, Chip
+  TableContainer, TableHead, TableRow, CircularProgress, Chip, Button
 } from '@mui/material';
 
 const getStatusChip = (status) => {
@@ -18,24 +18,31 @@ const getStatusChip = (status) => {
 
 const Logs = () => {
   const [logs, setLogs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const navigate = useNavigate();
 
+  const fetchLogs = async (cursor) => {
+    try {
+      const response = await getImportLogs(cursor);
+      setLogs((previous) => (cursor ? [...previous, ...response.data.results] : response.data.results));
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      setError('Failed to fetch sync history.');
+    }
+  };
+
   useEffect(() => {
-    const fetchLogs = async () => {
-      try {
-        const response = await getImportLogs();
-        setLogs(response.data);
-      } catch (err) {
-        setError('Failed to fetch sync history.');
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchLogs();
+    fetchLogs().finally(() => setLoading(false));
   }, []);
 
+  const loadMore = () => {
+    setLoadingMore(true);
+    fetchLogs(nextCursor).finally(() => setLoadingMore(false));
+  };
+
   return (
     <Container maxWidth="lg">
         <Typography variant="h4" gutterBottom>
@@ -74,6 +81,13 @@ const Logs = () => {
               ))}
             </TableBody>
           </Table>
+          {nextCursor && (
+            <Box sx={{ display: 'flex', justifyContent: 'center', p: 2 }}>
+              <Button onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </Button>
+            </Box>
+          )}
         </TableContainer>
       )}
     </Container>
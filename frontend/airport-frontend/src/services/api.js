@@ -1,7 +1,9 @@
 import axios from 'axios';
 
+// Same-origin by default: in Docker nginx proxies /api/ to the backend (and micro-caches public
+// reads); `npm start` forwards it through the "proxy" entry in package.json.
 const api = axios.create({
-  baseURL: 'http://127.0.0.1:8000/api/',
+  baseURL: process.env.REACT_APP_API_BASE_URL || '/api/',
 });
 
 // --- Airport API functions ---
@@ -14,6 +16,16 @@ export const getAirports = () => {
   return api.get('/airports/');
 };
 
+/**
+ * Type-ahead suggestions for an IATA code or city name prefix, most searched first.
+ * @param {string} q - Typed text.
+ * @param {number} [limit=10] - Maximum number of suggestions.
+ * @returns {Promise<{query: string, results: Array<object>}>}
+ */
+export const autocompleteAirports = (q, limit = 10) => {
+  return api.get('/airports/autocomplete/', { params: { q, limit } });
+};
+
 /**
  * Trigger the airports synchronization process.
  * @param {string} user - Username for external API (if required).
@@ -33,11 +45,12 @@ export const triggerImport = (user, password) => {
 // --- Import Logs API functions ---
 
 /**
- * Fetch synchronization history logs.
- * @returns {Promise<Array<object>>}
+ * Fetch one page of synchronization history logs (newest first).
+ * @param {string} [cursor] - `next_cursor` returned by the previous page.
+ * @returns {Promise<{results: Array<object>, next_cursor: ?string, page_size: number}>}
  */
-export const getImportLogs = () => {
-  return api.get('/import-logs/');
+export const getImportLogs = (cursor) => {
+  return api.get('/import-logs/', { params: cursor ? { cursor } : {} });
 };
 
 /**